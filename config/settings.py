@@ -128,3 +128,25 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Seconds to keep cached PlayerPosition / Position lookups (league/utils/positions.py)
+
+POSITION_CACHE_TIMEOUT = 3600
+
+
+# Rows per bulk_update when Player.recompute_scores writes fantasy_score
+
+SCORE_BULK_BATCH_SIZE = 500
+
+
+# HTTP response cache for the import commands (league/utils/http.py).
+# Only used when requests-cache is installed; NHL data changes at most daily.
+# import_players reads through it unless --max-age-hours 0; import_adp only with --cache.
+
+HTTP_CACHE_NAME = str(BASE_DIR / "nhl_http_cache")
+HTTP_CACHE_HOURS = 12
+
+# ETag / Last-Modified store for conditional GETs (update_stats, update_injuries)
+
+HTTP_CONDITIONAL_CACHE = str(BASE_DIR / "nhl_conditional_cache.sqlite3")
@@ -1,18 +1,25 @@
-from nhlpy import NHLClient
 import pprint
 
+from nhl_fetch import get_roster, get_skater_stats, get_teams, pooled_client
+
 SEASON = "20242025"
 
 def main():
-    client = NHLClient()
+    client, http = pooled_client()
+    try:
+        run(client)
+    finally:
+        http.close()
+
 
+def run(client):
     # Team info
-    teams = client.teams.teams()
+    teams = get_teams(client)
     team = teams[0]
     print("Using team:", team["name"], "| Abbr:", team["abbr"])
 
     # Load roster
-    roster = client.teams.team_roster(team["abbr"], SEASON)
+    roster = get_roster(client, team["abbr"], SEASON)
 
     # Flatten roster (forwards + defense + goalies)
     all_players = roster["forwards"] + roster["defensemen"] + roster["goalies"]
@@ -25,21 +32,11 @@ def main():
     print(f"\nFetching stats for: {full_name} (ID: {pid})")
 
     # Load ALL skater stats for this franchise
-    stats_list = client.stats.skater_stats_summary(
-        start_season=SEASON,
-        end_season=SEASON,
-        franchise_id=str(team["franchise_id"]),
-        game_type_id=2,
-        aggregate=False,
-        limit=500
-    )
-
-    # Find matching player
-    stat_line = None
-    for row in stats_list:
-        if str(row.get("playerId")) == str(pid):
-            stat_line = row
-            break
+    stats_list = get_skater_stats(client, team["franchise_id"], SEASON)
+
+    # Index stats by player id once; lookups for any roster player are O(1)
+    by_pid = {str(row.get("playerId")): row for row in stats_list}
+    stat_line = by_pid.get(str(pid))
 
     if not stat_line:
         print("\n❌ No stats found for this player.")
@@ -1,17 +1,24 @@
-from nhlpy import NHLClient
 import pprint
 
+from nhl_fetch import get_roster, get_teams, pooled_client
+
 SEASON = "20242025"
 
 def main():
-    client = NHLClient()
+    client, http = pooled_client()
+    try:
+        run(client)
+    finally:
+        http.close()
+
 
-    teams = client.teams.teams()
+def run(client):
+    teams = get_teams(client)
     team = teams[0]
 
     print("Using team:", team["name"], "| Abbr:", team["abbr"])
 
-    roster = client.teams.team_roster(team["abbr"], SEASON)
+    roster = get_roster(client, team["abbr"], SEASON)
 
     print("\nRoster groups:", roster.keys())
 
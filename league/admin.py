@@ -1,5 +1,12 @@
 # league/admin.py
+import hashlib
+
 from django.contrib import admin
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.forms.models import BaseInlineFormSet
+from django.utils.functional import cached_property
 
 from league.draft.services import DraftCreateConfig, create_or_rebuild_draft, start_draft
 
@@ -20,6 +27,31 @@ from .models import (
 )
 
 
+# ======================
+# PAGINATION
+# ======================
+class CachedCountPaginator(Paginator):
+    """
+    Caches the changelist COUNT(*) for a short window, keyed by the query SQL.
+    Counts on the big tables (Player, DraftPick) may lag by up to a minute.
+    """
+    count_cache_timeout = 60
+
+    @cached_property
+    def count(self):
+        try:
+            sql, params = self.object_list.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+
+        key = "admin-count:" + hashlib.md5(f"{sql}|{params}".encode()).hexdigest()
+        total = cache.get(key)
+        if total is None:
+            total = self.object_list.count()
+            cache.set(key, total, self.count_cache_timeout)
+        return total
+
+
 # ======================
 # LEAGUE
 # ======================
@@ -38,6 +70,7 @@ class LeagueRoleAdmin(admin.ModelAdmin):
     list_filter = ("role",)
     search_fields = ("league__name", "user__username")
     ordering = ("league", "user")
+    list_select_related = ("league", "user")
 
 
 # ======================
@@ -49,6 +82,7 @@ class TeamAdmin(admin.ModelAdmin):
     list_filter = ("league",)
     search_fields = ("name", "manager__username", "league__name")
     ordering = ("league", "name")
+    list_select_related = ("league", "manager")
 
 
 # ======================
@@ -65,9 +99,12 @@ class PlayerAdmin(admin.ModelAdmin):
         "is_active",
         "on_waivers",
     )
-    search_fields = ("full_name", "nhl_team_abbr", "nhl_id")
+    search_fields = ("full_name", "nhl_team_abbr", "=nhl_id")
     list_filter = ("nhl_team_abbr", "position", "is_active", "on_waivers")
     ordering = ("full_name",)
+    paginator = CachedCountPaginator
+    list_per_page = 50
+    show_full_result_count = False  # skip the extra unfiltered COUNT(*) on searches
 
     fields = (
         "full_name",
@@ -86,6 +123,14 @@ class PlayerAdmin(admin.ModelAdmin):
         "fantasy_score",
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        # collapse whitespace; single characters would match most of the table
+        search_term = " ".join(search_term.split())
+        if len(search_term) < 2:
+            return queryset, False
+        return super().get_search_results(request, queryset, search_term)
+
+
 # ======================
 # PLAYER POSITION
 # ======================
@@ -104,6 +149,7 @@ class PositionAdmin(admin.ModelAdmin):
     list_filter = ("league",)
     search_fields = ("code", "league__name")
     filter_horizontal = ("allowed_player_positions",)
+    list_select_related = ("league",)
 
 
 # ======================
@@ -115,15 +161,46 @@ class RosterAdmin(admin.ModelAdmin):
     list_filter = ("team__league", "team")
     search_fields = ("team__name", "player__full_name")
 
+    def get_queryset(self, request):
+        # the changelist skips list_select_related once the queryset has a select_related()
+        return super().get_queryset(request).with_related("team__league")
+
 
 # ======================
 # DAILY LINEUP
 # ======================
+class DailySlotFormSet(BaseInlineFormSet):
+    """
+    Checks the lineup's slots together with DailySlot.bulk_clean(): two
+    queries for the whole lineup instead of one per row.
+    """
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        form.instance._bulk_clean_pending = True
+        return form
+
+    def clean(self):
+        super().clean()
+        if any(self.errors):
+            return
+        DailySlot.bulk_clean(
+            form.instance for form in self.forms if form.cleaned_data and not form.cleaned_data.get("DELETE")
+        )
+
+
+class DailySlotInline(admin.TabularInline):
+    model = DailySlot
+    formset = DailySlotFormSet
+    extra = 0
+
+
 @admin.register(DailyLineup)
 class DailyLineupAdmin(admin.ModelAdmin):
+    inlines = (DailySlotInline,)
     list_display = ("team", "date")
     list_filter = ("team__league", "team", "date")
     search_fields = ("team__name",)
+    list_select_related = ("team__league",)
 
 
 @admin.register(DailySlot)
@@ -132,6 +209,9 @@ class DailySlotAdmin(admin.ModelAdmin):
     list_filter = ("slot",)
     search_fields = ("lineup__team__name", "player__full_name")
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_related("lineup__team", "slot__league")
+
 
 # ======================
 # SCORING CATEGORY
@@ -141,6 +221,7 @@ class ScoringCategoryAdmin(admin.ModelAdmin):
     list_display = ("league", "stat_key", "name", "weight", "lower_is_better", "is_goalie")
     list_filter = ("league", "is_goalie", "lower_is_better")
     search_fields = ("league__name", "stat_key", "name")
+    list_select_related = ("league",)
 
 
 # ======================
@@ -181,6 +262,7 @@ class DraftAdmin(admin.ModelAdmin):
     list_filter = ("draft_type", "order_mode", "is_active", "is_completed")
     search_fields = ("league__name",)
     actions = (action_build_draft_grid, action_start_draft)
+    list_select_related = ("league",)
 
 
 @admin.register(DraftPick)
@@ -198,6 +280,10 @@ class DraftPickAdmin(admin.ModelAdmin):
     list_filter = ("draft", "round_number", "team", "status")
     search_fields = ("player__full_name", "team__name")
     ordering = ("draft", "round_number", "pick_number")
+    paginator = CachedCountPaginator
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_related("draft__league", "team__league")
 
 
 @admin.register(DraftOrder)
@@ -205,3 +291,4 @@ class DraftOrderAdmin(admin.ModelAdmin):
     list_display = ("draft", "team", "position")
     list_filter = ("draft",)
     ordering = ("draft", "position")
+    list_select_related = ("draft__league", "team__league")
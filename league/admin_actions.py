@@ -1,37 +1,37 @@
 # league/admin_actions.py
 
+from collections import defaultdict
+
 from django.contrib import messages
+from django.db import transaction
 from django.shortcuts import redirect
 
-from .models import DraftOrder
+from .draft.services import DRAFT_BULK_BATCH_SIZE
+from .models import DraftOrder, Team
 
 
+@transaction.atomic
 def action_generate_draft_order(modeladmin, request, queryset):
     """
     Admin action: generate draft order for selected drafts.
 
-    Note: This intentionally avoids importing Team directly, because Team may not
-    be importable yet (your current issue). We pull teams via the league.team_set
-    reverse relation instead.
+    Teams for every selected league are fetched in one query and the order
+    rows for all drafts go out in a single bulk_create.
     """
-    for draft in queryset:
-        # Delete old order
-        DraftOrder.objects.filter(draft=draft).delete()
-
-        # Teams that belong to this league (reverse FK: Team.league -> League)
-        # This works as long as Team has a ForeignKey to League named "league".
-        teams = draft.league.team_set.all().order_by("id")
+    # Delete old order for every selected draft in one statement
+    DraftOrder.objects.filter(draft__in=queryset).delete()
 
-        # Create order
-        for i, team in enumerate(teams, start=1):
-            DraftOrder.objects.create(
-                draft=draft,
-                team=team,
-                position=i,
-            )
+    teams_by_league = defaultdict(list)
+    for team in Team.objects.filter(league_id__in=queryset.values("league_id")).order_by("id").only("id", "league_id"):
+        teams_by_league[team.league_id].append(team)
 
-        # Your Draft model no longer has draft_order_generated
-        draft.save()
+    rows = []
+    for draft in queryset.only("id", "league_id"):
+        rows.extend(
+            DraftOrder(draft=draft, team=team, position=i)
+            for i, team in enumerate(teams_by_league[draft.league_id], start=1)
+        )
+    DraftOrder.objects.bulk_create(rows, batch_size=DRAFT_BULK_BATCH_SIZE)
 
     messages.success(request, "Draft order generated successfully.")
     return redirect(request.get_full_path())
@@ -41,11 +41,7 @@ def action_reset_draft_order(modeladmin, request, queryset):
     """
     Admin action: reset/delete draft order.
     """
-    for draft in queryset:
-        DraftOrder.objects.filter(draft=draft).delete()
-
-        # Your Draft model no longer has draft_order_generated
-        draft.save()
+    DraftOrder.objects.filter(draft__in=queryset).delete()
 
     messages.success(request, "Draft order reset.")
     return redirect(request.get_full_path())
@@ -5,19 +5,31 @@ from rest_framework.response import Response
 from league.models import Player
 from league.serializers import PlayerSerializer
 
+SEARCH_LIMIT = 25
+
 
 @api_view(["GET"])
 def player_search(request):
     """
     Search for players by name fragment.
     Example: /api/players/search?q=mcd
+
+    Prefix matches come first (served by the full_name index); substring
+    matches only fill the remaining slots.
     """
     query = request.GET.get("q", "").strip()
 
     if not query:
         return Response({"results": []})
 
-    players = Player.objects.filter(full_name__icontains=query).order_by("full_name")[:25]
+    players = list(Player.objects.filter(full_name__istartswith=query).order_by("full_name")[:SEARCH_LIMIT])
+
+    if len(players) < SEARCH_LIMIT:
+        players += list(
+            Player.objects.filter(full_name__icontains=query)
+            .exclude(id__in=[p.id for p in players])
+            .order_by("full_name")[: SEARCH_LIMIT - len(players)]
+        )
 
     serializer = PlayerSerializer(players, many=True)
     return Response({"results": serializer.data})
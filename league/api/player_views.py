@@ -1,16 +1,33 @@
 # league/api/players_views.py
 
+from django.db.models import Q
 from rest_framework import generics, filters
 from league.models import Player
 from league.serializers import PlayerSerializer
 
+
+class PlayerSearchFilter(filters.BaseFilterBackend):
+    """
+    ?search=<q> matches a full_name prefix, or an exact team abbreviation / position.
+    Replaces SearchFilter's ILIKE '%q%' across five (partly nonexistent) columns.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        q = request.query_params.get(self.search_param, "").strip()
+        if not q:
+            return queryset
+        return queryset.filter(
+            Q(full_name__istartswith=q) | Q(nhl_team_abbr__iexact=q) | Q(position__iexact=q)
+        )
+
+
 class PlayerListAPIView(generics.ListAPIView):
     queryset = Player.objects.all()
     serializer_class = PlayerSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["first_name", "last_name", "full_name", "team", "position"]
+    filter_backends = [PlayerSearchFilter]
 
 class PlayerDetailAPIView(generics.RetrieveAPIView):
     queryset = Player.objects.all()
     serializer_class = PlayerSerializer
-
@@ -9,3 +9,5 @@ class LeagueConfig(AppConfig):
     def ready(self):
         # ✅ Ensures Django loads matchup models without importing them inside models.py
         import league.models_matchups  # noqa: F401
+        import league.utils.positions  # noqa: F401  (cache invalidation receivers)
+        import league.utils.rosters  # noqa: F401  (Team roster counter receivers)
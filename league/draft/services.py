@@ -4,14 +4,20 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import List, Optional, Sequence
 
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
-from league.models import Draft, DraftOrder, DraftPick, Player, Roster, Team
+from league.models import Draft, DraftAvailability, DraftOrder, DraftPick, Player, Team
+from league.utils.rosters import add_to_roster, sync_roster_counts
 
 
+# rows per INSERT for every draft table written in bulk (order, pick grid, availability)
+DRAFT_BULK_BATCH_SIZE = 1000
+
 @dataclass(frozen=True)
 class DraftCreateConfig:
     rounds: int
@@ -46,12 +52,16 @@ def create_or_rebuild_draft(*, draft: Draft, config: DraftCreateConfig) -> Draft
     draft.started_at = None
     draft.completed_at = None
     draft.current_pick_started_at = None
+    draft.current_pick_deadline = None
     draft.save()
 
-    teams = list(Team.objects.filter(league=draft.league).select_related("manager").order_by("id"))
+    teams = list(Team.objects.filter(league_id=draft.league_id).only("id", "name").order_by("id"))
     if len(teams) < 2:
         raise ValueError("Need at least 2 teams in the league to create a draft.")
 
+    # autopick reads the denormalized roster counts; start the draft from exact values
+    sync_roster_counts(league_id=draft.league_id)
+
     # wipe existing grid/order (safe because you're in beta)
     DraftPick.objects.filter(draft=draft).delete()
     if draft.order_mode != "MANUAL":
@@ -66,32 +76,42 @@ def create_or_rebuild_draft(*, draft: Draft, config: DraftCreateConfig) -> Draft
                 DraftOrder(draft=draft, team=team, position=i)
                 for i, team in enumerate(base_order, start=1)
             ],
-            batch_size=200,
+            batch_size=DRAFT_BULK_BATCH_SIZE,
         )
 
-    # build picks
-    picks: List[DraftPick] = []
-    pick_number = 1
+    picks = build_draft_picks(draft=draft, base_order=base_order)
+
+    _update_draft(draft, total_picks=len(picks))
+    return draft
+
+
+def build_draft_picks(*, draft: Draft, base_order: Sequence[Team]) -> List[DraftPick]:
+    """
+    Bulk-creates the rounds x teams DraftPick grid for a round-1 order.
+    SNAKE: odd rounds base, even rounds reversed; LINEAR: every round base.
+    Existing picks must already be deleted.
+    """
+    forward = list(base_order)
+    reverse = forward[::-1]
+    picks: List[Optional[DraftPick]] = [None] * (draft.rounds * len(forward))
+    idx = 0
 
     for round_number in range(1, draft.rounds + 1):
-        round_teams = _teams_for_round(base_order, round_number, draft_type=draft.draft_type)
+        round_teams = forward if (draft.draft_type == "LINEAR" or round_number % 2 == 1) else reverse
         for team in round_teams:
-            picks.append(
-                DraftPick(
-                    draft=draft,
-                    team=team,
-                    player=None,
-                    round_number=round_number,
-                    pick_number=pick_number,
-                    status=DraftPick.STATUS_UPCOMING,
-                    started_at=None,
-                    made_at=None,
-                )
+            picks[idx] = DraftPick(
+                draft=draft,
+                team=team,
+                player=None,
+                round_number=round_number,
+                pick_number=idx + 1,
+                status=DraftPick.STATUS_UPCOMING,
+                started_at=None,
+                made_at=None,
             )
-            pick_number += 1
+            idx += 1
 
-    DraftPick.objects.bulk_create(picks, batch_size=500)
-    return draft
+    return DraftPick.objects.bulk_create(picks, batch_size=DRAFT_BULK_BATCH_SIZE)
 
 
 def _get_base_order(*, draft: Draft, teams: Sequence[Team]) -> List[Team]:
@@ -99,61 +119,89 @@ def _get_base_order(*, draft: Draft, teams: Sequence[Team]) -> List[Team]:
     Returns the round-1 team order.
     """
     if draft.order_mode == "RANDOM":
-        base = list(teams)
-        random.shuffle(base)
-        return base
+        return random.sample(teams, len(teams))
 
     if draft.order_mode == "ALPHA":
         return sorted(list(teams), key=lambda t: (t.name or "").lower())
 
     if draft.order_mode == "MANUAL":
-        rows = list(DraftOrder.objects.filter(draft=draft).select_related("team").order_by("position"))
+        rows = list(
+            DraftOrder.objects.filter(draft_id=draft.id).order_by("position").values_list("position", "team_id")
+        )
+        # (draft, position) and (draft, team) are unique in the DB, so a matching
+        # count means every team has exactly one slot; only relative order matters
         if len(rows) != len(teams):
             raise ValueError("MANUAL order_mode requires DraftOrder positions 1..N already created.")
-        # validate positions contiguous 1..N
-        for idx, row in enumerate(rows, start=1):
-            if row.position != idx:
-                raise ValueError("DraftOrder positions must be contiguous starting at 1.")
-        return [r.team for r in rows]
+        # map back onto the already-loaded teams instead of joining Team again
+        by_id = {t.id: t for t in teams}
+        try:
+            return [by_id[team_id] for _position, team_id in rows]
+        except KeyError:
+            raise ValueError("DraftOrder references a team outside this league.") from None
 
     raise ValueError(f"Unknown order_mode: {draft.order_mode}")
 
 
-def _teams_for_round(base_order: Sequence[Team], round_number: int, *, draft_type: str) -> Sequence[Team]:
-    """
-    SNAKE: odd rounds base, even rounds reversed
-    LINEAR: every round base
-    """
-    if draft_type == "LINEAR":
-        return base_order
-    # default snake behavior
-    if round_number % 2 == 1:
-        return base_order
-    return list(reversed(base_order))
-
-
 # ================================================================
 # Draft runtime: no pause, always clock + auto-pick
 # ================================================================
 
+# columns the clock/pick services and the draft room template read; everything
+# else stays deferred
+_SERVICE_FIELDS = (
+    "id",
+    "league__id",
+    "league__name",
+    "draft_type",
+    "order_mode",
+    "rounds",
+    "time_per_pick",
+    "is_active",
+    "is_completed",
+    "current_pick",
+    "current_pick_started_at",
+    "current_pick_deadline",
+    "completed_at",
+    "total_picks",
+)
+
+
+def draft_service_queryset():
+    """
+    Drafts loaded for the draft room, tick_draft, make_pick and autopick_current:
+    league joined in and only the columns they read selected, so nothing
+    lazy-loads.
+    """
+    return Draft.objects.select_related("league").only(*_SERVICE_FIELDS)
+
+
 @transaction.atomic
 def start_draft(*, draft: Draft) -> DraftPick:
     if draft.is_completed:
         raise ValueError("Draft is already completed.")
 
-    # ensure picks exist
-    if not DraftPick.objects.filter(draft=draft).exists():
+    # ensure picks exist; the count is stored so advancing never recounts teams
+    total_picks = DraftPick.objects.filter(draft=draft).count()
+    if not total_picks:
         raise ValueError("Draft has no picks. Build the draft grid first.")
 
-    draft.is_active = True
-    draft.started_at = draft.started_at or timezone.now()
-    draft.current_pick = 1
-    draft.current_pick_started_at = timezone.now()
-    draft.save(update_fields=["is_active", "started_at", "current_pick", "current_pick_started_at"])
+    # the counters may have drifted since the grid was built (position changes)
+    sync_roster_counts(league_id=draft.league_id)
+
+    now = timezone.now()
+    _update_draft(
+        draft,
+        is_active=True,
+        started_at=draft.started_at or now,
+        current_pick=1,
+        current_pick_started_at=now,
+        current_pick_deadline=now + timedelta(seconds=draft.time_per_pick),
+        total_picks=total_picks,
+    )
 
-    first = DraftPick.objects.get(draft=draft, pick_number=1)
-    _set_on_clock(first)
-    return first
+    build_draft_availability(draft=draft)
+    _set_on_clock(draft=draft, pick_number=1)
+    return get_current_pick(draft=draft)
 
 
 def tick_draft(*, draft: Draft) -> Optional[DraftPick]:
@@ -165,19 +213,60 @@ def tick_draft(*, draft: Draft) -> Optional[DraftPick]:
     if not draft.is_active or draft.is_completed:
         return None
 
+    # expiry is decided from the in-memory Draft, so the running-clock case
+    # (nearly every poll) never touches DraftPick here
+    if is_pick_expired(draft=draft):
+        # many pollers can see the same expired pick; the Draft row lock queues
+        # them and the re-check lets only the first one autopick
+        with transaction.atomic():
+            _lock_draft(draft)
+            # another request may have autopicked while we waited for the lock
+            if draft.is_active and is_pick_expired(draft=draft):
+                row = _get_current_pick_lite(draft)
+                if row is not None:
+                    _autopick(draft=draft, current=row)
+
     current = get_current_pick(draft=draft)
-    if current is None:
+    if current is None and draft.is_active and not draft.is_completed:
         # safety repair
-        return advance_to_next_pick(draft=draft)
+        current = get_current_pick(draft=draft) if advance_to_next_pick(draft=draft) else None
+    return current
 
-    if is_pick_expired(draft=draft):
-        autopick_current(draft=draft)
-        return get_current_pick(draft=draft) or (None if draft.is_completed else advance_to_next_pick(draft=draft))
 
-    return current
+# Draft row is always locked first (make_pick, autopick, advance) so concurrent
+# manual picks and expiry autopicks queue up instead of deadlocking.
+_CLOCK_FIELDS = [
+    "is_active",
+    "is_completed",
+    "current_pick",
+    "current_pick_started_at",
+    "current_pick_deadline",
+    "completed_at",
+    "total_picks",
+]
+
+
+def _lock_draft(draft: Draft) -> None:
+    """
+    SELECT ... FOR UPDATE on the Draft row, refreshing the clock fields in place.
+    """
+    draft.refresh_from_db(fields=_CLOCK_FIELDS, from_queryset=Draft.objects.select_for_update())
+
+
+def _get_current_pick_lite(draft: Draft) -> Optional[dict]:
+    """
+    The on-clock pick as a plain dict of the columns the pick/autopick checks
+    need; no model instances are built. Use get_current_pick() for a DraftPick.
+    """
+    return (
+        DraftPick.objects.filter(draft_id=draft.id, status=DraftPick.STATUS_ON_CLOCK)
+        .values("id", "pick_number", "team_id", "team__manager_id", "team__goalie_count", "player_id", "started_at")
+        .first()
+    )
 
 
 def get_current_pick(*, draft: Draft) -> Optional[DraftPick]:
+    # one query on the draftpick_on_clock_idx partial index (a single row per draft)
     return (
         DraftPick.objects.filter(draft=draft, status=DraftPick.STATUS_ON_CLOCK)
         .select_related("team", "player")
@@ -186,37 +275,42 @@ def get_current_pick(*, draft: Draft) -> Optional[DraftPick]:
 
 
 @transaction.atomic
-def make_pick(*, draft: Draft, user, player_id: int) -> DraftPick:
+def make_pick(*, draft: Draft, user, player_id: int) -> None:
     """
     Manual pick:
       - must be active
       - user must own the team currently on the clock
       - player must be undrafted in this draft
     """
+    _lock_draft(draft)
     if not draft.is_active or draft.is_completed:
         raise ValueError("Draft is not active.")
 
-    current = get_current_pick(draft=draft)
+    current = _get_current_pick_lite(draft)
     if current is None:
         raise ValueError("No pick is currently on the clock.")
 
-    if current.team.manager_id != user.id:
+    if current["team__manager_id"] != user.id:
         raise PermissionError("Not your pick.")
 
-    if DraftPick.objects.filter(draft=draft, player_id=player_id).exists():
-        raise ValueError("Player already drafted.")
-
-    player = Player.objects.get(id=player_id)
-
-    current.player = player
-    current.status = DraftPick.STATUS_MADE
-    current.made_at = timezone.now()
-    current.save(update_fields=["player", "status", "made_at"])
+    # claim the pick in one UPDATE; uniq_draftpick_draft_player rejects a player
+    # already drafted in this draft, the EXISTS guard replaces the Player lookup
+    try:
+        updated = (
+            DraftPick.objects.filter(id=current["id"], status=DraftPick.STATUS_ON_CLOCK)
+            .filter(Exists(Player.objects.filter(id=player_id)))
+            .update(player_id=player_id, status=DraftPick.STATUS_MADE, made_at=timezone.now())
+        )
+    except IntegrityError:
+        raise ValueError("Player already drafted.") from None
+    if not updated:
+        raise Player.DoesNotExist(f"Player {player_id} does not exist.")
 
     # roster add (optional but useful for position-need autopick)
-    Roster.objects.get_or_create(team=current.team, player=player)
+    add_to_roster(team_id=current["team_id"], player_id=player_id)
+    DraftAvailability.objects.filter(draft_id=draft.id, player_id=player_id).delete()
 
-    return advance_to_next_pick(draft=draft) or current
+    _advance(draft=draft)
 
 
 def is_pick_expired(*, draft: Draft) -> bool:
@@ -227,30 +321,48 @@ def is_pick_expired(*, draft: Draft) -> bool:
 
 
 @transaction.atomic
-def advance_to_next_pick(*, draft: Draft) -> Optional[DraftPick]:
+def advance_to_next_pick(*, draft: Draft) -> bool:
+    """
+    Moves the clock to the next pick. Returns False once the draft is completed.
+    """
+    _lock_draft(draft)
+    return _advance(draft=draft)
+
+
+def _advance(*, draft: Draft) -> bool:
+    # caller holds the Draft row lock
     next_number = draft.current_pick + 1
-    total_picks = draft.rounds * Team.objects.filter(league=draft.league).count()
+    if next_number > draft.total_picks:
+        _update_draft(draft, is_completed=True, is_active=False, completed_at=timezone.now(), current_pick_deadline=None)
+        return False
 
-    if next_number > total_picks:
-        draft.is_completed = True
-        draft.is_active = False
-        draft.completed_at = timezone.now()
-        draft.save(update_fields=["is_completed", "is_active", "completed_at"])
-        return None
+    now = timezone.now()
+    _update_draft(
+        draft,
+        current_pick=next_number,
+        current_pick_started_at=now,
+        current_pick_deadline=now + timedelta(seconds=draft.time_per_pick),
+    )
 
-    draft.current_pick = next_number
-    draft.current_pick_started_at = timezone.now()
-    draft.save(update_fields=["current_pick", "current_pick_started_at"])
+    _set_on_clock(draft=draft, pick_number=next_number)
+    return True
 
-    next_pick = DraftPick.objects.get(draft=draft, pick_number=next_number)
-    _set_on_clock(next_pick)
-    return next_pick
+
+def _update_draft(draft: Draft, **fields) -> None:
+    """
+    Single queryset UPDATE (no save() / signals), mirrored onto the in-memory instance.
+    """
+    Draft.objects.filter(pk=draft.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(draft, name, value)
 
 
-def _set_on_clock(pick: DraftPick) -> None:
-    pick.status = DraftPick.STATUS_ON_CLOCK
-    pick.started_at = timezone.now()
-    pick.save(update_fields=["status", "started_at"])
+def _set_on_clock(*, draft: Draft, pick_number: int) -> None:
+    # one UPDATE keyed on (draft, pick_number); no SELECT, no full_clean()
+    DraftPick.objects.filter(draft_id=draft.id, pick_number=pick_number).update(
+        status=DraftPick.STATUS_ON_CLOCK,
+        started_at=timezone.now(),
+    )
 
 
 # ================================================================
@@ -259,66 +371,86 @@ def _set_on_clock(pick: DraftPick) -> None:
 # ================================================================
 
 @transaction.atomic
-def autopick_current(*, draft: Draft) -> DraftPick:
+def autopick_current(*, draft: Draft) -> Optional[int]:
     """
     Auto-pick the current ON_CLOCK pick:
       - choose needed position (G until team has 2 goalies, else skater)
       - pick highest fantasy_score available in that bucket
+    Returns the drafted player id (None if no players were left).
     """
-    current = get_current_pick(draft=draft)
+    _lock_draft(draft)
+    current = _get_current_pick_lite(draft)
     if current is None:
         raise ValueError("No pick on the clock to autopick.")
+    return _autopick(draft=draft, current=current)
 
-    preferred = _infer_team_need(team=current.team)
 
-    player = _best_available_player(draft=draft, preferred=preferred)
-    if player is None:
-        # No players left -> just complete/advance
-        current.status = DraftPick.STATUS_AUTO
-        current.made_at = timezone.now()
-        current.save(update_fields=["status", "made_at"])
-        advance_to_next_pick(draft=draft)
-        return current
+def _autopick(*, draft: Draft, current: dict) -> Optional[int]:
+    # caller holds the Draft row lock; every step below is a single short statement
+    preferred = _infer_team_need(goalie_count=current["team__goalie_count"])
+    player_id = _best_available_player_id(draft=draft, preferred=preferred)
 
-    current.player = player
-    current.status = DraftPick.STATUS_AUTO
-    current.made_at = timezone.now()
-    current.save(update_fields=["player", "status", "made_at"])
+    # player_id is None when no players are left; the pick is still closed out
+    DraftPick.objects.filter(id=current["id"]).update(
+        player_id=player_id,
+        status=DraftPick.STATUS_AUTO,
+        made_at=timezone.now(),
+    )
 
-    Roster.objects.get_or_create(team=current.team, player=player)
+    if player_id is not None:
+        add_to_roster(team_id=current["team_id"], player_id=player_id)
+        DraftAvailability.objects.filter(draft_id=draft.id, player_id=player_id).delete()
 
-    advance_to_next_pick(draft=draft)
-    return current
+    _advance(draft=draft)
+    return player_id
 
 
-def _infer_team_need(*, team: Team) -> str:
+def _infer_team_need(*, goalie_count: int) -> str:
     """
     Simple rule for now:
       - if team has < 2 goalies on roster, prefer goalies
       - else prefer skaters
+    Uses the denormalized Team.goalie_count, so no query is issued.
     """
-    goalie_count = (
-        Roster.objects.filter(team=team, player__position__icontains="G").count()
-        if hasattr(Player, "position")
-        else 0
-    )
     return "G" if goalie_count < 2 else "SKATER"
 
 
-def _best_available_player(*, draft: Draft, preferred: str) -> Optional[Player]:
-    drafted_ids = DraftPick.objects.filter(draft=draft).exclude(player_id=None).values_list("player_id", flat=True)
-    qs = Player.objects.filter(is_active=True).exclude(id__in=drafted_ids)
+def build_draft_availability(*, draft: Draft) -> int:
+    """
+    Snapshots the undrafted active players into DraftAvailability, ranked by
+    fantasy_score. Players activated after this point are not autopicked.
+    """
+    DraftAvailability.objects.filter(draft_id=draft.id).delete()
+
+    drafted = DraftPick.objects.filter(draft_id=draft.id, player_id=OuterRef("pk"))
+    ranked = (
+        Player.objects.filter(is_active=True)
+        .filter(~Exists(drafted))
+        .order_by("-fantasy_score", "full_name")
+        .values_list("id", "is_goalie")
+    )
+    rows = [
+        DraftAvailability(
+            draft=draft,
+            bucket=DraftAvailability.BUCKET_GOALIE if is_goalie else DraftAvailability.BUCKET_SKATER,
+            rank=rank,
+            player_id=player_id,
+        )
+        for rank, (player_id, is_goalie) in enumerate(ranked.iterator(), start=1)
+    ]
+    DraftAvailability.objects.bulk_create(rows, batch_size=DRAFT_BULK_BATCH_SIZE)
+    return len(rows)
+
 
-    if preferred == "G":
-        qs_pref = qs.filter(position__icontains="G")
-    elif preferred == "SKATER":
-        qs_pref = qs.exclude(position__icontains="G")
-    else:
-        qs_pref = qs
+def _best_available_player_id(*, draft: Draft, preferred: str) -> Optional[int]:
+    # "highest ranked" = lowest DraftAvailability.rank (fantasy_score order at draft start)
+    available = DraftAvailability.objects.filter(draft_id=draft.id).order_by("rank").values_list("player_id", flat=True)
 
-    # "highest ranked" = highest fantasy_score (you can swap later to ADP/overall_rank)
-    player = qs_pref.order_by("-fantasy_score", "full_name").first()
-    if player:
-        return player
+    player_id = available.filter(bucket=preferred).first()
+    if player_id is None:
+        player_id = available.first()
 
-    return qs.order_by("-fantasy_score", "full_name").first()
+    # a draft switched on outside start_draft has no snapshot yet; build it on first use
+    if player_id is None and build_draft_availability(draft=draft):
+        return _best_available_player_id(draft=draft, preferred=preferred)
+    return player_id
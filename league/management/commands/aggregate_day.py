@@ -1,23 +1,57 @@
 # league/management/commands/aggregate_day.py
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date as date_type
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 from django.utils import timezone
 
 from league.models import League
 from league.services.daily_totals import compute_team_category_totals_for_day
 
 
+def _aggregate_league(league, day) -> int:
+    # each worker thread gets its own DB connection; close it when done
+    try:
+        return compute_team_category_totals_for_day(league=league, day=day)
+    finally:
+        connection.close()
+
+
 class Command(BaseCommand):
-    help = "Aggregate starter lineups into TeamCategoryTotal for a given league + date."
+    help = "Aggregate starter lineups into TeamCategoryTotal for one or more leagues on a date."
 
     def add_arguments(self, parser):
-        parser.add_argument("--league_id", type=int, required=True)
+        # one of these is required, as --league_id alone used to be
+        which = parser.add_mutually_exclusive_group(required=True)
+        which.add_argument("--league_id", type=int, default=None)
+        which.add_argument("--league_ids", type=int, nargs="+", default=None)
+        which.add_argument("--all", action="store_true", help="Aggregate every league.")
+        parser.add_argument("--workers", type=int, default=1, help="Leagues aggregated in parallel.")
         parser.add_argument("--date", type=str, default=None)  # YYYY-MM-DD
 
     def handle(self, *args, **options):
-        league = League.objects.get(id=options["league_id"])
         day = date_type.fromisoformat(options["date"]) if options["date"] else timezone.localdate()
 
-        written = compute_team_category_totals_for_day(league=league, day=day)
-        self.stdout.write(self.style.SUCCESS(f"Aggregated {written} TeamCategoryTotal rows for {league} on {day}."))
+        if options["all"]:
+            leagues = list(League.objects.order_by("id"))
+        else:
+            ids = options["league_ids"] or [options["league_id"]]
+            leagues = list(League.objects.filter(id__in=ids).order_by("id"))
+            missing = set(ids) - {lg.id for lg in leagues}
+            if missing:
+                raise CommandError(f"League id(s) not found: {sorted(missing)}")
+
+        workers = max(1, options["workers"])
+        if connection.vendor == "sqlite":
+            workers = 1  # single-writer database: parallel leagues would just hit "database is locked"
+
+        if workers == 1 or len(leagues) < 2:
+            results = [(lg, compute_team_category_totals_for_day(league=lg, day=day)) for lg in leagues]
+        else:
+            # leagues touch disjoint TeamCategoryTotal rows, so they can run side by side
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(zip(leagues, pool.map(lambda lg: _aggregate_league(lg, day), leagues)))
+
+        for league, written in results:
+            self.stdout.write(self.style.SUCCESS(f"Aggregated {written} TeamCategoryTotal rows for {league} on {day}."))
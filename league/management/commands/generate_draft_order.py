@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+from league.draft.services import DRAFT_BULK_BATCH_SIZE, build_draft_picks
 from league.models import League, Team, Draft, DraftOrder, DraftPick
 
 
@@ -57,7 +59,7 @@ class Command(BaseCommand):
         except League.DoesNotExist:
             raise CommandError(f"League id={league_id} not found.")
 
-        teams_qs = Team.objects.filter(league=league).select_related("manager")
+        teams_qs = Team.objects.filter(league=league)
         team_count = teams_qs.count()
 
         if team_count < 2:
@@ -91,12 +93,11 @@ class Command(BaseCommand):
             )
 
         # Build initial team list according to seed method
-        teams = list(teams_qs)
-
         if seed == "alpha":
-            teams.sort(key=lambda t: (t.name or "").lower())
+            teams = list(teams_qs.order_by(Lower("name")))
         elif seed == "random":
             import random
+            teams = list(teams_qs)
             random.shuffle(teams)
         elif seed == "standings":
             # Placeholder: You can wire this up later when you track standings.
@@ -116,13 +117,18 @@ class Command(BaseCommand):
                 [
                     DraftOrder(draft=draft, team=team, position=i + 1)
                     for i, team in enumerate(teams)
-                ]
+                ],
+                batch_size=DRAFT_BULK_BATCH_SIZE,
             )
 
+            # Pre-build the full rounds x teams pick grid in one bulk insert
+            picks = build_draft_picks(draft=draft, base_order=teams)
+
             # Reset draft state
             draft.is_active = False
             draft.is_completed = False
             draft.current_pick = 1
+            draft.total_picks = len(picks)
             draft.started_at = None
             draft.completed_at = None
             draft.save()
@@ -132,6 +138,7 @@ class Command(BaseCommand):
         self.stdout.write(f"Teams: {team_count}")
         self.stdout.write(f"Draft type: {draft.draft_type}")
         self.stdout.write(f"Rounds: {draft.rounds}")
+        self.stdout.write(f"Picks: {draft.total_picks}")
         self.stdout.write(f"Time per pick: {draft.time_per_pick}s")
         self.stdout.write(f"Seed: {seed}")
         self.stdout.write("Order:")
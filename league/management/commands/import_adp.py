@@ -2,22 +2,30 @@
 
 from __future__ import annotations
 
-import re
-import unicodedata
 from dataclasses import dataclass
-from io import StringIO
+from io import BytesIO
 from typing import Optional
 
-import requests
 import pandas as pd
+from lxml import etree
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 from league.models import Player
+from league.utils.bulk import update_column_by_id
+from league.utils.http import build_session
+from league.utils.names import base_name_key as _base_name_key, clean_name as _clean_name
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional; without it unmatched names stay unmatched
+    process = None
 
 
 DEFAULT_URL = "https://www.fantasypros.com/nhl/adp/overall.php"
 DEFAULT_TIMEOUT = 25
+# minimum rapidfuzz WRatio (0-100) to accept a fuzzy name match
+FUZZY_CUTOFF = 90
 
 # IMPORTANT: Only strip a trailing token if it's a REAL NHL team abbreviation.
 TEAM_ABBRS = {
@@ -44,66 +52,25 @@ class AdpRow:
     avg: Optional[float]
 
 
-def _to_int(val) -> Optional[int]:
-    try:
-        if pd.isna(val):
-            return None
-        return int(str(val).strip())
-    except Exception:
-        return None
-
-
-def _to_float(val) -> Optional[float]:
-    try:
-        if pd.isna(val):
-            return None
-        s = str(val).strip()
-        if s == "" or s.lower() in {"na", "n/a", "none", "-"}:
-            return None
-        return float(s)
-    except Exception:
-        return None
-
-
-def _clean_name(name: str) -> str:
-    return " ".join(str(name).replace("\u00a0", " ").split()).strip()
-
-
-def _strip_accents(s: str) -> str:
-    return "".join(
-        ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch)
+def _clean_series(col: pd.Series) -> pd.Series:
+    # same result as _clean_name, per column: nbsp -> space, collapse whitespace
+    return (
+        col.fillna("")
+        .astype(str)
+        .str.replace("\u00a0", " ", regex=False)
+        .str.split()
+        .str.join(" ")
     )
 
 
-def _base_name_key(s: str) -> str:
-    """
-    Normalize names: case/accents/punct/suffixes.
-    Does NOT strip trailing team abbrev. (that's handled separately)
-    """
-    s = _clean_name(s).lower()
-    s = _strip_accents(s)
-
-    # handle "Last, First"
-    if "," in s:
-        last, first = [p.strip() for p in s.split(",", 1)]
-        if last and first:
-            s = f"{first} {last}"
-
-    # normalize punctuation
-    s = s.replace("st.", "st")
-    s = s.replace("'", "")          # O'Reilly -> oreilly
-    s = s.replace("-", " ")         # hyphen -> space
+def _numeric_or_none(df: pd.DataFrame, col: Optional[str]) -> pd.Series:
+    if col is None:
+        return pd.Series([None] * len(df), index=df.index, dtype="float64")
+    return pd.to_numeric(df[col], errors="coerce")
 
-    # remove parentheses content
-    s = re.sub(r"\([^)]*\)", "", s)
 
-    # remove suffixes
-    s = re.sub(r"\b(jr|sr|ii|iii|iv|v)\b\.?", "", s)
-
-    # keep only letters/spaces
-    s = re.sub(r"[^a-z\s]", " ", s)
-
-    return " ".join(s.split())
+def _none_if_nan(val) -> Optional[float]:
+    return None if pd.isna(val) else float(val)
 
 
 def _adp_name_key(s: str) -> str:
@@ -128,65 +95,56 @@ def _adp_name_key(s: str) -> str:
     return k
 
 
-def _db_name_key(s: str) -> str:
+def _iter_table_rows(html: str):
     """
-    Key for your DB Player.full_name.
-    DO NOT strip 2-4 letter tokens (that was the bug: Fox/Hill/Aho/etc).
+    Streams the cell texts of every <tr> on the page. Each row is cleared (and
+    its finished siblings dropped) once read, so memory stays at about one row
+    instead of the whole DOM. Yields (table element, [cell texts]).
     """
-    k = _base_name_key(s)
-    k = k.replace("alexandar georgiev", "alexander georgiev")
-    return k
-
-
-def _normalize_headers(df: pd.DataFrame) -> pd.DataFrame:
-    if df is None or df.empty:
-        return df
-
-    cols = list(df.columns)
-    looks_unnamed = all(
-        isinstance(c, int) or str(c).strip().lower().startswith("unnamed")
-        for c in cols
+    # the page is already decoded; say so, or lxml falls back to latin-1 when
+    # there is no <meta charset> and mangles names like "Stützle"
+    ctx = etree.iterparse(
+        BytesIO(html.encode("utf-8")), events=("end",), tag="tr", html=True, encoding="utf-8"
     )
-    if not looks_unnamed:
-        return df
-
-    first_row = [str(x).strip() for x in df.iloc[0].tolist()]
-    first_lc = [x.lower() for x in first_row]
-    if "rank" in first_lc and "player" in first_lc and ("avg" in first_lc or "pos" in first_lc):
-        df2 = df.copy()
-        df2.columns = first_row
-        df2 = df2.iloc[1:].reset_index(drop=True)
-        return df2
-
-    return df
+    for _, tr in ctx:
+        cells = ["".join(cell.itertext()).strip() for cell in tr if cell.tag in ("td", "th")]
+        yield next(tr.iterancestors("table"), None), cells
+        tr.clear()
+        while tr.getprevious() is not None:
+            del tr.getparent()[0]
 
 
-def _pick_adp_table(tables: list[pd.DataFrame]) -> pd.DataFrame:
-    wanted = ["rank", "player", "team", "pos", "avg", "yahoo", "espn", "cbs"]
-
-    best: Optional[pd.DataFrame] = None
-    best_score = -1
-
-    for t in tables:
-        t = _normalize_headers(t)
-        cols = [str(c).strip().lower() for c in t.columns]
-
-        score = 0
-        for w in wanted:
-            if any(c == w or w in c for c in cols):
-                score += 1
-
-        if score > best_score:
-            best = t
-            best_score = score
+def _read_adp_table(html: str) -> pd.DataFrame:
+    """
+    The ADP table as a DataFrame: the first row with a cell containing "rank"
+    and one containing "player" (case-insensitive, the same substring match
+    _map_columns falls back to, so "Player Team (Bye)" counts) is the header,
+    and data rows are the same-width rows of that table.
+    """
+    table = None
+    headers: list[str] = []
+    rows: list[list[str]] = []
+
+    for tbl, cells in _iter_table_rows(html):
+        if table is None:
+            lowered = [c.lower() for c in cells]
+            if any("rank" in c for c in lowered) and any("player" in c for c in lowered):
+                table, headers = tbl, cells
+            continue
+        if tbl is not table:
+            break  # past the ADP table
+        if len(cells) == len(headers):  # skip ad/spacer rows
+            rows.append(cells)
 
-    if best is None or best_score < 4:
-        raise CommandError("Could not locate ADP table in the HTML (headers may be missing/shifted).")
+    if table is None:
+        raise CommandError("No ADP table found in HTML. Source may have changed.")
+    if not rows:
+        raise CommandError("ADP table found, but it has no data rows.")
 
-    return best
+    return pd.DataFrame(rows, columns=headers)
 
 
-def _fetch_html(url: str) -> str:
+def _fetch_html(url: str, *, cached: bool = False) -> str:
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -195,38 +153,45 @@ def _fetch_html(url: str) -> str:
         ),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
     }
-    resp = requests.get(url, headers=headers, timeout=DEFAULT_TIMEOUT)
+    if not cached:
+        headers["Cache-Control"] = "no-cache"
+        headers["Pragma"] = "no-cache"
+    resp = build_session(pool_size=1, headers=headers, cached=cached).get(url, timeout=DEFAULT_TIMEOUT)
     resp.raise_for_status()
     return resp.text
 
 
-def _find_col(adp_df: pd.DataFrame, target: str) -> Optional[str]:
-    t = target.lower()
-    for c in adp_df.columns:
-        c_lc = str(c).strip().lower()
-        if c_lc == t or t in c_lc:
-            return c
-    return None
+ADP_COLUMNS = ("rank", "player", "team", "pos", "avg", "yahoo", "espn", "cbs")
+
 
+def _map_columns(adp_df: pd.DataFrame) -> dict[str, Optional[str]]:
+    """
+    One pass over the headers: {wanted name: DataFrame column or None}.
+    Exact (case-insensitive) header matches come from a dict lookup; only the
+    names left over fall back to a substring scan (e.g. "AVG ADP" for "avg").
+    """
+    by_lc: dict[str, str] = {}
+    for c in adp_df.columns:
+        by_lc.setdefault(str(c).strip().lower(), c)
 
-def _parse_from_html(url: str) -> list[AdpRow]:
-    html = _fetch_html(url)
+    found = {w: by_lc.get(w) for w in ADP_COLUMNS}
+    for w in ADP_COLUMNS:
+        if found[w] is None:
+            found[w] = next((c for lc, c in by_lc.items() if w in lc), None)
+    return found
 
-    try:
-        tables = pd.read_html(StringIO(html))
-    except ValueError:
-        raise CommandError("No tables found in HTML. Source may have changed.")
 
-    adp_df = _pick_adp_table(tables)
+def _parse_from_html(url: str, *, cached: bool = False) -> list[AdpRow]:
+    html = _fetch_html(url, cached=cached)
+    adp_df = _read_adp_table(html)
 
-    rank_col = _find_col(adp_df, "rank")
-    player_col = _find_col(adp_df, "player")
-    team_col = _find_col(adp_df, "team")
-    pos_col = _find_col(adp_df, "pos")
-    avg_col = _find_col(adp_df, "avg")
+    cols = _map_columns(adp_df)
+    rank_col = cols["rank"]
+    player_col = cols["player"]
+    team_col = cols["team"]
+    pos_col = cols["pos"]
+    avg_col = cols["avg"]
 
     missing = [
         n for n, c in [
@@ -243,37 +208,46 @@ def _parse_from_html(url: str) -> list[AdpRow]:
             f"Found columns: {[str(c) for c in adp_df.columns]}"
         )
 
-    yahoo_col = _find_col(adp_df, "yahoo")
-    espn_col = _find_col(adp_df, "espn")
-    cbs_col = _find_col(adp_df, "cbs")
-
-    rows: list[AdpRow] = []
-    for _, r in adp_df.iterrows():
-        rank = _to_int(r[rank_col])
-        name = _clean_name(r[player_col])
-        team = _clean_name(r[team_col])
-        pos = _clean_name(r[pos_col])
-        avg = _to_float(r[avg_col])
-
-        yahoo = _to_float(r[yahoo_col]) if yahoo_col else None
-        espn = _to_float(r[espn_col]) if espn_col else None
-        cbs = _to_float(r[cbs_col]) if cbs_col else None
-
-        if rank is None or not name:
-            continue
-
-        rows.append(
-            AdpRow(
-                rank=rank,
-                name=name,
-                team=team,
-                pos=pos,
-                yahoo=yahoo,
-                espn=espn,
-                cbs=cbs,
-                avg=avg,
-            )
+    yahoo_col = cols["yahoo"]
+    espn_col = cols["espn"]
+    cbs_col = cols["cbs"]
+
+    # vectorized cell conversion; unparseable values ("-", "N/A", "") become NA
+    df = pd.DataFrame({
+        "rank": pd.to_numeric(adp_df[rank_col], errors="coerce").astype("Int64"),
+        "name": _clean_series(adp_df[player_col]),
+        "team": _clean_series(adp_df[team_col]),
+        "pos": _clean_series(adp_df[pos_col]),
+        "yahoo": _numeric_or_none(adp_df, yahoo_col),
+        "espn": _numeric_or_none(adp_df, espn_col),
+        "cbs": _numeric_or_none(adp_df, cbs_col),
+        "avg": _numeric_or_none(adp_df, avg_col),
+    })
+    df = df.dropna(subset=["rank"])
+    df = df[df["name"] != ""]
+
+    rows: list[AdpRow] = [
+        AdpRow(
+            rank=int(rank),
+            name=name,
+            team=team,
+            pos=pos,
+            yahoo=_none_if_nan(yahoo),
+            espn=_none_if_nan(espn),
+            cbs=_none_if_nan(cbs),
+            avg=_none_if_nan(avg),
         )
+        for rank, name, team, pos, yahoo, espn, cbs, avg in zip(
+            df["rank"].tolist(),
+            df["name"].tolist(),
+            df["team"].tolist(),
+            df["pos"].tolist(),
+            df["yahoo"].tolist(),
+            df["espn"].tolist(),
+            df["cbs"].tolist(),
+            df["avg"].tolist(),
+        )
+    ]
 
     if not rows:
         raise CommandError("No ADP rows parsed. The table may be empty or the layout changed.")
@@ -281,6 +255,30 @@ def _parse_from_html(url: str) -> list[AdpRow]:
     return rows
 
 
+def _fuzzy_match(unmatched: set[str], by_name: dict) -> list[tuple[str, str, float]]:
+    """
+    Maps each unmatched ADP key onto the closest name_key of a player not
+    already matched (rapidfuzz WRatio >= FUZZY_CUTOFF), adding it to by_name.
+    Returns (adp key, db key, score) for logging.
+    """
+    taken = {pid for pid, _ in by_name.values()}
+    candidates: dict[str, tuple[int, Optional[float]]] = {
+        key: (pid, adp)
+        for pid, key, adp in Player.objects.exclude(name_key="").values_list("id", "name_key", "adp")
+        if pid not in taken
+    }
+
+    pairs = []
+    for key in sorted(unmatched):
+        hit = process.extractOne(key, candidates.keys(), scorer=fuzz.WRatio, score_cutoff=FUZZY_CUTOFF)
+        if hit is None:
+            continue
+        db_key, score = hit[0], hit[1]
+        by_name[key] = candidates.pop(db_key)  # one player per ADP row
+        pairs.append((key, db_key, score))
+    return pairs
+
+
 class Command(BaseCommand):
     help = "Import player ADP into Player.adp (FantasyPros by default)."
 
@@ -289,6 +287,12 @@ class Command(BaseCommand):
         parser.add_argument("--dry-run", action="store_true")
         parser.add_argument("--limit", type=int, default=0)
         parser.add_argument("--debug-missing", type=int, default=0, help="Print first N missing name pairs")
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Reuse an ADP page fetched within HTTP_CACHE_HOURS (needs requests-cache). Off by default.",
+        )
+        parser.add_argument("--no-fuzzy", action="store_true", help="Exact name_key matches only.")
 
     def handle(self, *args, **options):
         url: str = options["url"]
@@ -297,22 +301,23 @@ class Command(BaseCommand):
         debug_missing: int = options["debug_missing"] or 0
 
         self.stdout.write(f"Fetching ADP from: {url}")
-        adp_rows = _parse_from_html(url)
+        adp_rows = _parse_from_html(url, cached=options["cache"])
 
         if limit > 0:
             adp_rows = adp_rows[:limit]
 
-        # Your model field
-        name_field = "full_name"
-        players = Player.objects.all().only("id", name_field, "adp", "nhl_id")
+        # only the players whose stored name_key matches a parsed row (indexed IN lookup)
+        wanted_keys = {_adp_name_key(row.name) for row in adp_rows}
+        # plain tuples, no model instances: key -> (id, current adp)
+        by_name: dict[str, tuple[int, Optional[float]]] = {
+            key: (pid, adp)
+            for pid, key, adp in Player.objects.filter(name_key__in=wanted_keys).values_list("id", "name_key", "adp")
+        }
 
-        # DB key map (DO NOT strip team suffix here)
-        by_name: dict[str, Player] = {}
-        for p in players:
-            val = getattr(p, name_field, None)
-            if not val:
-                continue
-            by_name[_db_name_key(val)] = p
+        fuzzy_pairs: list[tuple[str, str, float]] = []
+        unmatched = wanted_keys - by_name.keys()
+        if unmatched and process is not None and not options["no_fuzzy"]:
+            fuzzy_pairs = _fuzzy_match(unmatched, by_name)
 
         wrote = 0
         matched = 0
@@ -321,10 +326,11 @@ class Command(BaseCommand):
 
         def apply_updates():
             nonlocal wrote, matched, missing
+            new_adp_by_id: dict[int, float] = {}
             for row in adp_rows:
                 key = _adp_name_key(row.name)
-                p = by_name.get(key)
-                if not p:
+                hit = by_name.get(key)
+                if not hit:
                     missing += 1
                     if debug_missing and len(missing_samples) < debug_missing:
                         missing_samples.append((row.name, key))
@@ -333,13 +339,17 @@ class Command(BaseCommand):
                 matched += 1
                 new_adp = row.avg if row.avg is not None else float(row.rank)
 
-                if p.adp is not None and float(p.adp) == float(new_adp):
+                pid, cur_adp = hit
+                cur_adp = new_adp_by_id.get(pid, cur_adp)
+                if cur_adp is not None and float(cur_adp) == float(new_adp):
                     continue
 
-                p.adp = new_adp
-                p.save(update_fields=["adp"])
+                new_adp_by_id[pid] = new_adp
                 wrote += 1
 
+            # one UPDATE ... FROM (VALUES ...) on PostgreSQL, bulk_update elsewhere
+            update_column_by_id(Player, "adp", new_adp_by_id)
+
         if dry_run:
             for row in adp_rows:
                 if _adp_name_key(row.name) in by_name:
@@ -359,6 +369,13 @@ class Command(BaseCommand):
         self.stdout.write(f"Wrote updates: {wrote}")
         self.stdout.write(f"Missing (no name match): {missing}")
 
+        if fuzzy_pairs:
+            # review these; recurring ones belong in the normalization rules
+            self.stdout.write("")
+            self.stdout.write(f"Fuzzy matches (score >= {FUZZY_CUTOFF}):")
+            for key, db_key, score in fuzzy_pairs:
+                self.stdout.write(f"  - {key}  ~>  {db_key}  ({score:.0f})")
+
         if missing_samples:
             self.stdout.write("")
             self.stdout.write("Sample missing (FantasyPros name -> normalized key):")
@@ -1,34 +1,65 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
 from django.core.management.base import BaseCommand
 from league.models import Player, PlayerAdvancedStats
+from league.utils.http import build_session
 
 ADVANCED_ENDPOINT = (
     "https://statsapi.web.nhl.com/api/v1/people/{player_id}/stats"
     "?stats=statsSingleSeasonAdvanced"
 )
 
+FETCH_WORKERS = 16
+
+# PlayerAdvancedStats field -> key in the API "stat" payload
+STAT_FIELDS = {
+    "corsi_for": "corsiFor",
+    "corsi_against": "corsiAgainst",
+    "corsi_pct": "corsiPercentage",
+
+    "fenwick_for": "fenwickFor",
+    "fenwick_against": "fenwickAgainst",
+    "fenwick_pct": "fenwickPercentage",
+
+    "xg": "expectedGoals",
+    "ixg": "individualExpectedGoals",
+    "xga": "expectedGoalsAgainst",
+    "xgf_pct": "expectedGoalsPercentage",
+
+    "hdcf": "highDangerCorsiFor",
+    "hdca": "highDangerCorsiAgainst",
+    "hdcf_pct": "highDangerCorsiPercentage",
+
+    "points_per_60": "pointsPer60",
+    "goals_per_60": "goalsPer60",
+    "assists_per_60": "assistsPer60",
+}
+
 class Command(BaseCommand):
     help = "Import advanced NHL stats (xG, CF%, HD metrics) for all players."
 
     def fetch_advanced(self, player_id):
         url = ADVANCED_ENDPOINT.format(player_id=player_id)
         try:
-            r = requests.get(url, timeout=10)
+            r = self.session.get(url, timeout=10)
             r.raise_for_status()
             return r.json()
         except Exception:
             return None
 
     def handle(self, *args, **kwargs):
+        self.session = build_session(pool_size=FETCH_WORKERS)
         self.stdout.write("Fetching advanced stats...")
 
-        total = 0
-        updated = 0
+        players = list(Player.objects.only("id", "nhl_id", "full_name"))
+        total = len(players)
 
-        for player in Player.objects.all():
-            total += 1
+        # network-bound; the session's connection pool is sized to match
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            payloads = list(pool.map(lambda p: self.fetch_advanced(p.nhl_id), players))
 
-            data = self.fetch_advanced(player.nhl_id)
+        rows = []
+        for player, data in zip(players, payloads):
             if not data:
                 self.stdout.write(
                     self.style.WARNING(f"Failed advanced stats for {player.full_name}")
@@ -48,33 +79,22 @@ class Command(BaseCommand):
 
             stat = stats_list[0].get("stat", {})
 
-            adv, _ = PlayerAdvancedStats.objects.update_or_create(
-                player=player,
-                defaults={
-                    "corsi_for": stat.get("corsiFor", 0),
-                    "corsi_against": stat.get("corsiAgainst", 0),
-                    "corsi_pct": stat.get("corsiPercentage", 0),
-
-                    "fenwick_for": stat.get("fenwickFor", 0),
-                    "fenwick_against": stat.get("fenwickAgainst", 0),
-                    "fenwick_pct": stat.get("fenwickPercentage", 0),
-
-                    "xg": stat.get("expectedGoals", 0),
-                    "ixg": stat.get("individualExpectedGoals", 0),
-                    "xga": stat.get("expectedGoalsAgainst", 0),
-                    "xgf_pct": stat.get("expectedGoalsPercentage", 0),
-
-                    "hdcf": stat.get("highDangerCorsiFor", 0),
-                    "hdca": stat.get("highDangerCorsiAgainst", 0),
-                    "hdcf_pct": stat.get("highDangerCorsiPercentage", 0),
-
-                    "points_per_60": stat.get("pointsPer60", 0),
-                    "goals_per_60": stat.get("goalsPer60", 0),
-                    "assists_per_60": stat.get("assistsPer60", 0),
-                }
+            rows.append(
+                PlayerAdvancedStats(
+                    player=player,
+                    **{field: stat.get(key, 0) for field, key in STAT_FIELDS.items()},
+                )
             )
 
-            updated += 1
+        # one upsert per batch instead of a SELECT + UPDATE/INSERT per player
+        PlayerAdvancedStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["player"],
+            update_fields=[*STAT_FIELDS, "updated"],
+            batch_size=500,
+        )
+        updated = len(rows)
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -2,7 +2,8 @@
 # ✅ UPDATED: adds ADP support (optional CSV) + keeps your NHL import intact
 #
 # HOW IT WORKS
-# 1) Imports/updates NHL players as before
+# 1) Imports/updates NHL players from the team roster payloads
+#    and each player's landing page for season totals (--skip-stats skips those)
 # 2) If you pass --adp-csv=/path/to/adp.csv it will apply ADP values by name (and optional team)
 #
 # CSV FORMAT (recommended headers):
@@ -12,18 +13,49 @@
 #
 # EXAMPLES:
 # python manage.py import_players
+# python manage.py import_players --skip-stats   (rosters only, much faster)
 # python manage.py import_players --adp-csv "C:\Users\you\Downloads\adp.csv"
 
 import csv
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+
 import requests
 from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from league.utils.bulk import bulk_update_fields, update_column_by_id
+from league.utils.http import DEFAULT_HEADERS as HEADERS, build_session
+
+# landing/roster requests in flight at once (pure network wait, so threads are fine)
+DEFAULT_WORKERS = 24
+# players whose stats were refreshed more recently than this skip the landing fetch
+DEFAULT_MAX_AGE_HOURS = 24
+# updated_at for players that have never had a stats refresh
+STALE = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+
+# Player fields filled from a /roster/{team}/current entry
+ROSTER_FIELDS = ["full_name", "position", "number", "shoots", "nhl_team_abbr"]
 
 
-def fetch_landing(player_id: int):
+def _roster_fields(player_id: int, p: dict, team_abbrev: str) -> dict:
+    first = (p.get("firstName") or {}).get("default", "") or ""
+    last = (p.get("lastName") or {}).get("default", "") or ""
+    pos_code = (p.get("positionCode") or "").strip()
+    jersey = p.get("sweaterNumber")
+    return {
+        "full_name": f"{first} {last}".strip() or str(player_id),
+        "position": "" if pos_code == "UNK" else pos_code,
+        "number": str(jersey) if jersey is not None else "",
+        "shoots": str(p.get("shootsCatches") or ""),
+        "nhl_team_abbr": team_abbrev,
+    }
+
+
+def fetch_landing(player_id: int, session: requests.Session | None = None):
     url = f"https://api-web.nhle.com/v1/player/{player_id}/landing"
-    headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
     try:
-        r = requests.get(url, headers=headers, timeout=10)
+        r = (session or requests).get(url, headers=HEADERS, timeout=10)
         r.raise_for_status()
         return r.json()
     except Exception:
@@ -40,10 +72,30 @@ class Command(BaseCommand):
             default=None,
             help="Optional path to a CSV containing ADP data (headers: full_name,adp OR full_name,team,adp).",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f"Concurrent HTTP requests for rosters + player landings (default: {DEFAULT_WORKERS}).",
+        )
+        parser.add_argument(
+            "--skip-stats",
+            action="store_true",
+            help="Only refresh roster fields; skip the per-player landing requests for season totals.",
+        )
+        parser.add_argument(
+            "--max-age-hours",
+            type=float,
+            default=DEFAULT_MAX_AGE_HOURS,
+            help=(
+                f"Skip players updated within this many hours (default: {DEFAULT_MAX_AGE_HOURS}). "
+                "Responses are otherwise reused from the HTTP cache for HTTP_CACHE_HOURS; "
+                "0 refetches everything from the network."
+            ),
+        )
 
-    def safe_json(self, url: str):
-        headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
-        r = requests.get(url, headers=headers, timeout=15)
+    def safe_json(self, url: str, session: requests.Session | None = None):
+        r = (session or requests).get(url, headers=HEADERS, timeout=15)
         r.raise_for_status()
         return r.json()
 
@@ -53,6 +105,7 @@ class Command(BaseCommand):
         applied = 0
         missing = 0
         bad = 0
+        new_adp = {}  # pk -> adp, written in one statement below
 
         with open(path, "r", encoding="utf-8-sig", newline="") as f:
             reader = csv.DictReader(f)
@@ -93,91 +146,157 @@ class Command(BaseCommand):
 
                 if player.adp != adp_val:
                     player.adp = adp_val
-                    player.save(update_fields=["adp"])
+                    new_adp[player.pk] = adp_val
                 applied += 1
 
-        self.stdout.write(self.style.SUCCESS(f"ADP applied: {applied}, missing: {missing}, bad rows: {bad}"))
+        update_column_by_id(Player, "adp", new_adp)
 
-    def handle(self, *args, **kwargs):
-        from league.models import Player
-
-        self.stdout.write("Fetching NHL standings...")
-        standings = self.safe_json("https://api-web.nhle.com/v1/standings/now")
-        teams = standings.get("standings", [])
+        self.stdout.write(self.style.SUCCESS(f"ADP applied: {applied}, missing: {missing}, bad rows: {bad}"))
 
+    def _save_roster_fields(self, Player, entries) -> int:
+        """
+        Name/position/number/team straight from the roster payloads: one SELECT,
+        then bulk_update + bulk_create. Stats (and updated_at, which tracks the
+        last stats refresh) are left alone.
+        """
+        existing = Player.objects.in_bulk(list(entries), field_name="nhl_id")
+        to_update, to_create = [], []
+
+        for player_id, (team_abbrev, p) in entries.items():
+            fields = _roster_fields(player_id, p, team_abbrev)
+            obj = existing.get(player_id)
+            if obj is None:
+                obj = Player(nhl_id=player_id, on_waivers=False, is_active=True, **fields)
+                to_create.append(obj)
+            else:
+                for name, value in fields.items():
+                    setattr(obj, name, value)
+                obj.is_active = True
+                to_update.append(obj)
+            obj.sync_derived_fields()  # bulk ops skip save()
+
+        bulk_update_fields(Player, to_update, [*ROSTER_FIELDS, "name_key", "is_goalie", "is_active"])
+        created = Player.objects.bulk_create(to_create, batch_size=500)
+        # new rows have no stats yet; keep them stale until a landing is saved for them
+        Player.objects.filter(nhl_id__in=[obj.nhl_id for obj in created]).update(updated_at=STALE)
+        return len(to_update) + len(created)
+
+    def _save_with_stats(self, Player, entries, landings) -> int:
         imported = 0
-
-        for team in teams:
-            team_name = team.get("teamName", {}).get("default", "Unknown")
-            team_abbrev = team.get("teamAbbrev", {}).get("default")  # e.g. "WPG"
-            if not team_abbrev:
+        for player_id, info in landings.items():
+            if not info or "firstName" not in info or "lastName" not in info:
                 continue
+            team_abbrev, p = entries[player_id]
+
+            first = info["firstName"].get("default", "") or ""
+            last = info["lastName"].get("default", "") or ""
+            full_name = info.get("fullName") or f"{first} {last}".strip() or str(player_id)
+
+            pos_code = (info.get("positionCode") or "").strip()
+            if pos_code == "UNK":
+                pos_code = ""
+
+            raw_stats = info.get("seasonTotals", {})
+            if isinstance(raw_stats, dict):
+                stats = raw_stats
+            elif isinstance(raw_stats, list) and raw_stats and isinstance(raw_stats[0], dict):
+                stats = raw_stats[0]
+            else:
+                stats = {}
+
+            games = int(stats.get("gamesPlayed", 0) or 0)
+            goals = int(stats.get("goals", 0) or 0)
+            assists = int(stats.get("assists", 0) or 0)
+            points = stats.get("points", None)
+            if points is None:
+                points = goals + assists
+            points = int(points)
+
+            jersey = info.get("sweaterNumber")
+            shoots = info.get("shootsCatches") or ""
+
+            # simple ranking placeholder
+            fantasy_score = float(points)
+
+            Player.objects.update_or_create(
+                nhl_id=player_id,
+                defaults={
+                    "full_name": full_name,
+                    "position": pos_code,
+                    "shoots": str(shoots),
+                    "number": str(jersey) if jersey is not None else "",
+                    "nhl_team_abbr": team_abbrev,
+                    "games_played": games,
+                    "goals": goals,
+                    "assists": assists,
+                    "points": points,
+                    "fantasy_score": fantasy_score,
+                    "on_waivers": False,
+                    "is_active": True,
+                    # ✅ adp left as-is unless you supply --adp-csv
+                },
+            )
+            imported += 1
+        return imported
 
-            self.stdout.write(f"Fetching roster for: {team_name} ({team_abbrev})")
-            roster = self.safe_json(f"https://api-web.nhle.com/v1/roster/{team_abbrev}/current")
-
-            players = roster.get("forwards", []) + roster.get("defensemen", []) + roster.get("goalies", [])
+    def handle(self, *args, **kwargs):
+        from league.models import Player
 
-            for p in players:
-                player_id = p.get("id")
-                if not player_id:
-                    continue
+        workers = max(1, kwargs.get("workers") or DEFAULT_WORKERS)
+        max_age = kwargs.get("max_age_hours")
+        max_age = DEFAULT_MAX_AGE_HOURS if max_age is None else max_age
+        # shared by every worker thread; --max-age-hours 0 skips the HTTP cache too
+        session = build_session(pool_size=workers, cached=max_age > 0)
 
-                info = fetch_landing(int(player_id))
-                if not info or "firstName" not in info or "lastName" not in info:
-                    continue
+        self.stdout.write("Fetching NHL standings...")
+        standings = self.safe_json("https://api-web.nhle.com/v1/standings/now", session)
 
-                first = info["firstName"].get("default", "") or ""
-                last = info["lastName"].get("default", "") or ""
-                full_name = info.get("fullName") or f"{first} {last}".strip() or str(player_id)
-
-                pos_code = (info.get("positionCode") or "").strip()
-                if pos_code == "UNK":
-                    pos_code = ""
-
-                raw_stats = info.get("seasonTotals", {})
-                if isinstance(raw_stats, dict):
-                    stats = raw_stats
-                elif isinstance(raw_stats, list) and raw_stats and isinstance(raw_stats[0], dict):
-                    stats = raw_stats[0]
-                else:
-                    stats = {}
-
-                games = int(stats.get("gamesPlayed", 0) or 0)
-                goals = int(stats.get("goals", 0) or 0)
-                assists = int(stats.get("assists", 0) or 0)
-                points = stats.get("points", None)
-                if points is None:
-                    points = goals + assists
-                points = int(points)
-
-                jersey = info.get("sweaterNumber")
-                shoots = info.get("shootsCatches") or ""
-
-                # simple ranking placeholder
-                fantasy_score = float(points)
-
-                Player.objects.update_or_create(
-                    nhl_id=str(player_id),
-                    defaults={
-                        "full_name": full_name,
-                        "position": pos_code,
-                        "shoots": str(shoots),
-                        "number": str(jersey) if jersey is not None else "",
-                        "nhl_team_abbr": team_abbrev,
-                        "games_played": games,
-                        "goals": goals,
-                        "assists": assists,
-                        "points": points,
-                        "fantasy_score": fantasy_score,
-                        "on_waivers": False,
-                        "is_active": True,
-                        # ✅ adp left as-is unless you supply --adp-csv
-                    },
-                )
-                imported += 1
+        team_abbrevs = []
+        for team in standings.get("standings", []):
+            team_abbrev = team.get("teamAbbrev", {}).get("default")  # e.g. "WPG"
+            if team_abbrev:
+                team_abbrevs.append(team_abbrev)
+
+        def fetch_roster(team_abbrev):
+            return self.safe_json(f"https://api-web.nhle.com/v1/roster/{team_abbrev}/current", session)
+
+        with_stats = not kwargs.get("skip_stats")
+        fresh = set()
+        if with_stats and max_age > 0:
+            cutoff = timezone.now() - timedelta(hours=max_age)
+            fresh = set(Player.objects.filter(updated_at__gte=cutoff).values_list("nhl_id", flat=True))
+
+        skipped_fresh = 0
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            self.stdout.write(f"Fetching {len(team_abbrevs)} rosters...")
+            rosters = list(pool.map(fetch_roster, team_abbrevs))
+
+            # one entry per unique player id across every roster
+            entries = {}
+            for team_abbrev, roster in zip(team_abbrevs, rosters):
+                players = roster.get("forwards", []) + roster.get("defensemen", []) + roster.get("goalies", [])
+                for p in players:
+                    if p.get("id"):
+                        entries.setdefault(int(p["id"]), (team_abbrev, p))
+
+            landings = {}
+            if with_stats:
+                # season totals only live on the landing page; skip recently refreshed players
+                stale = [pid for pid in entries if pid not in fresh]
+                skipped_fresh = len(entries) - len(stale)
+                self.stdout.write(f"Fetching {len(stale)} player landings...")
+                landings = dict(zip(stale, pool.map(lambda pid: fetch_landing(pid, session), stale)))
+
+        # identity fields for everyone (picks up trades), then season totals where fetched
+        imported = self._save_roster_fields(Player, entries)
+        if with_stats:
+            stats_saved = self._save_with_stats(Player, entries, landings)
+            self.stdout.write(f"Refreshed season stats for {stats_saved} players.")
 
         self.stdout.write(self.style.SUCCESS(f"Imported or updated {imported} NHL players successfully."))
+        if skipped_fresh:
+            self.stdout.write(f"Skipped {skipped_fresh} players whose stats were refreshed within {max_age:g}h.")
 
         adp_csv = kwargs.get("adp_csv")
         if adp_csv:
@@ -1,24 +1,28 @@
+from collections import defaultdict
+
 from django.core.management.base import BaseCommand
-from league.models import Player, League, Roster
-from league.utils.scoring import calculate_player_score
+from league.models import League, Player, Roster
 
 class Command(BaseCommand):
     help = "Recalculate fantasy scores for all players in all leagues"
 
     def handle(self, *args, **kwargs):
-        leagues = League.objects.all()
-        updated = 0
+        # every rostered player in one query. Player.fantasy_score is a single
+        # column, so a player rostered in several leagues keeps the score from
+        # the highest league id (the last league the old per-league loop visited).
+        rosters = Roster.objects.order_by("team__league_id").values_list("team__league_id", "player_id")
+        league_for_player = {}
+        for league_id, player_id in rosters:
+            league_for_player[player_id] = league_id
 
-        for league in leagues:
-            # all players who belong to teams in this league
-            rostered_players = Player.objects.filter(
-                roster__team__league=league
-            ).distinct()
+        player_ids_by_league = defaultdict(list)
+        for player_id, league_id in league_for_player.items():
+            player_ids_by_league[league_id].append(player_id)
 
-            for player in rostered_players:
-                player.fantasy_score = calculate_player_score(player, league)
-                player.save(update_fields=["fantasy_score"])
-                updated += 1
+        updated = 0
+        for league in League.objects.filter(id__in=player_ids_by_league):
+            players = Player.objects.filter(id__in=player_ids_by_league[league.id]).iterator(chunk_size=1000)
+            updated += Player.recompute_scores(league, players=players)
 
         self.stdout.write(self.style.SUCCESS(
             f"Recalculated fantasy scores for {updated} players."
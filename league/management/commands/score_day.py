@@ -7,9 +7,8 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from league.models import League
-from league.models_matchups import Matchup
 from league.services.daily_totals import compute_team_category_totals_for_day
-from league.services.matchups import compute_and_store_matchup_results
+from league.services.matchups import compute_and_store_all_matchup_results
 from league.services.schedule import create_daily_matchups
 
 
@@ -37,9 +36,7 @@ class Command(BaseCommand):
         self.stdout.write(f"Ensured matchups for {day}. (created/ensured: {len(created)})")
 
         # 3) Score matchups (category vs category)
-        matchups = Matchup.objects.filter(league=league, date=day).select_related("home_team", "away_team")
-        for m in matchups:
-            summary = compute_and_store_matchup_results(matchup=m)
+        for m, summary in compute_and_store_all_matchup_results(league=league, day=day).items():
             self.stdout.write(f"{m}: {summary}")
 
         self.stdout.write(self.style.SUCCESS("Done."))
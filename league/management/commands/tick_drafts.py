@@ -0,0 +1,33 @@
+# league/management/commands/tick_drafts.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from league.draft.services import draft_service_queryset, tick_draft
+
+
+class Command(BaseCommand):
+    help = "Run the draft clock server-side: autopick expired picks for every active draft."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep ticking until interrupted.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between ticks with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            # only drafts whose clock has already run out, decided in SQL
+            expired = draft_service_queryset().filter(
+                is_active=True,
+                is_completed=False,
+                current_pick_deadline__lt=timezone.now(),
+            )
+            ticked = 0
+            for draft in expired:
+                tick_draft(draft=draft)
+                ticked += 1
+
+            if not options["loop"]:
+                self.stdout.write(self.style.SUCCESS(f"Ticked {ticked} expired drafts."))
+                return
+            time.sleep(options["interval"])
@@ -1,6 +1,8 @@
 import requests
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from league.models import Player
+from league.utils.http import ConditionalCache, build_session, loads_json
 
 NHL_TEAMS_URL = "https://statsapi.web.nhl.com/api/v1/teams?expand=team.roster"
 
@@ -8,17 +10,45 @@ NHL_TEAMS_URL = "https://statsapi.web.nhl.com/api/v1/teams?expand=team.roster"
 class Command(BaseCommand):
     help = "Updates injury status for all NHL players using the public NHL API"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Re-download the rosters instead of revalidating with ETag/Last-Modified.",
+        )
+
     def handle(self, *args, **kwargs):
         self.stdout.write("Fetching NHL roster data...")
+        session = build_session(pool_size=1, cached=False, retries=3)
+
+        if kwargs.get("no_cache"):
+            self._update(session, None)
+            return
+        # the roster ETag is only kept once the injury updates below are saved
+        with ConditionalCache() as cache:
+            self._update(session, cache)
 
+    def _update(self, session, cache):
         try:
-            data = requests.get(NHL_TEAMS_URL, timeout=10).json()
-        except:
-            self.stdout.write(self.style.ERROR("Failed to connect to NHL API"))
+            if cache is None:
+                r = session.get(NHL_TEAMS_URL, timeout=10)
+                r.raise_for_status()
+                data, changed = loads_json(r.content), True
+            else:
+                data, changed = cache.get_json(session, NHL_TEAMS_URL, timeout=10)
+        except (requests.RequestException, ValueError) as e:  # ValueError: body wasn't JSON
+            self.stdout.write(self.style.ERROR(f"Failed to fetch NHL rosters: {e}"))
             return
 
-        updated_count = 0
-        cleared_count = 0
+        if not changed:
+            self.stdout.write(self.style.SUCCESS("Rosters unchanged since the last run; nothing to update."))
+            return
+
+        # one SELECT for every player, keyed the way the roster payload identifies them
+        players_by_id = Player.objects.only("id", "nhl_id", "injured").in_bulk(field_name="nhl_id")
+
+        to_mark = {}  # injury status -> [pk], one UPDATE per status
+        to_clear = []
 
         for team in data.get("teams", []):
             roster = team.get("roster", {}).get("roster", [])
@@ -27,26 +57,27 @@ class Command(BaseCommand):
                 player_id = person["id"]
                 status = player.get("rosterStatus", "N")  # N = Normal
 
-                try:
-                    db_player = Player.objects.get(nhl_id=player_id)
-                except Player.DoesNotExist:
+                db_player = players_by_id.get(player_id)
+                if db_player is None:
                     continue
 
                 # Injury logic
                 if status in ("I", "IR"):
                     if not db_player.injured:
-                        db_player.injured = True
-                        db_player.injury_note = status
-                        db_player.save(update_fields=["injured", "injury_note"])
-                        updated_count += 1
+                        to_mark.setdefault(status, []).append(db_player.pk)
 
                 else:
                     # If previously marked injured and now healthy
                     if db_player.injured:
-                        db_player.injured = False
-                        db_player.injury_note = None
-                        db_player.save(update_fields=["injured", "injury_note"])
-                        cleared_count += 1
+                        to_clear.append(db_player.pk)
+
+        updated_count = 0
+        with transaction.atomic():
+            for status, pks in to_mark.items():
+                updated_count += Player.objects.filter(pk__in=pks).update(injured=True, injury_note=status)
+            cleared_count = Player.objects.filter(pk__in=to_clear).update(injured=False, injury_note=None)
+        if cache is not None:
+            cache.commit([NHL_TEAMS_URL])
 
         self.stdout.write(self.style.SUCCESS(
             f"Injury update complete. {updated_count} marked injured, {cleared_count} cleared."
@@ -8,50 +8,136 @@
 # Run:
 #   (venv) python manage.py update_player_stats
 # Options:
+#   (venv) python manage.py update_player_stats --workers 8
 #   (venv) python manage.py update_player_stats --sleep 0.10
 #   (venv) python manage.py update_player_stats --teams WPG,TOR,BOS
-#   (venv) python manage.py update_player_stats --limit 200
+#   (venv) python manage.py update_player_stats --limit 200   (first 200 landings, not 200 saved rows)
 #   (venv) python manage.py update_player_stats --only-existing
 
 from __future__ import annotations
 
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import Any
 
 import requests
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
 
+from league.utils.bulk import bulk_update_fields
+from league.utils.http import RETRY_STATUSES, ConditionalCache, build_session, loads_json
 
-NHL_HEADERS = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
 
+NHL_HEADERS = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
 
-def safe_json(url: str, timeout: int = 15, retries: int = 2) -> dict[str, Any]:
-    last_err = None
-    for _ in range(max(1, retries) + 1):
+# roster/landing requests in flight at once
+DEFAULT_WORKERS = 16
+
+# Player columns written from a landing payload (plus derived name_key/is_goalie)
+UPDATE_FIELDS = [
+    "full_name",
+    "name_key",
+    "position",
+    "is_goalie",
+    "number",
+    "shoots",
+    "nhl_team_abbr",
+    "games_played",
+    "goals",
+    "assists",
+    "points",
+    "fantasy_score",
+    "is_active",
+    "updated_at",
+]
+
+LANDING_URL = "https://api-web.nhle.com/v1/player/{}/landing"
+
+
+def _backoff_delay(attempt: int, response=None, base: float = 1.0, cap: float = 30.0) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
         try:
-            r = requests.get(url, headers=NHL_HEADERS, timeout=timeout)
-            r.raise_for_status()
-            data = r.json()
-            return data if isinstance(data, dict) else {}
+            return min(cap, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form; fall back to our own schedule
+    # 1s, 2s, 4s, 8s ... with +/-25% jitter so workers don't retry in lockstep
+    return min(cap, base * 2**attempt) * random.uniform(0.75, 1.25)
+
+
+def with_backoff(call, *, max_attempts: int = 5, base: float = 1.0, cap: float = 30.0):
+    """
+    Runs call() until it succeeds. Connection errors and RETRY_STATUSES
+    (raised via raise_for_status) are retried with exponential backoff;
+    any other HTTP error is raised straight away.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return call()
         except Exception as e:
-            last_err = e
-            time.sleep(0.5)
-    raise last_err  # type: ignore[misc]
+            response = getattr(e, "response", None)
+            status = getattr(response, "status_code", None)
+            if attempt == max_attempts - 1 or (status is not None and status not in RETRY_STATUSES):
+                raise
+            time.sleep(_backoff_delay(attempt, response, base, cap))
+
+
+def safe_json(
+    url: str,
+    timeout: int = 15,
+    max_attempts: int = 5,
+    session: requests.Session | None = None,
+    base: float = 1.0,
+    cap: float = 30.0,
+) -> dict[str, Any]:
+    def call():
+        r = (session or requests).get(url, headers=NHL_HEADERS, timeout=timeout)
+        r.raise_for_status()
+        data = loads_json(r.content)
+        return data if isinstance(data, dict) else {}
 
+    return with_backoff(call, max_attempts=max_attempts, base=base, cap=cap)
+
+
+def fetch_landing(
+    player_id: int, session: requests.Session | None = None, cache: ConditionalCache | None = None
+) -> tuple[dict[str, Any] | None, bool]:
+    """
+    (landing, changed). changed is False when the server answered 304 and
+    landing is the copy stored by the cache; (None, True) on failure.
+    """
+    url = LANDING_URL.format(player_id)
+
+    def call():
+        if cache is not None:
+            data, changed = cache.get_json(session or requests, url, headers=NHL_HEADERS, timeout=15)
+        else:
+            r = (session or requests).get(url, headers=NHL_HEADERS, timeout=15)
+            r.raise_for_status()
+            data, changed = loads_json(r.content), True
+        return (data if isinstance(data, dict) else None), changed
 
-def fetch_landing(player_id: int) -> dict[str, Any] | None:
-    url = f"https://api-web.nhle.com/v1/player/{player_id}/landing"
     try:
-        r = requests.get(url, headers=NHL_HEADERS, timeout=15)
-        r.raise_for_status()
-        data = r.json()
-        return data if isinstance(data, dict) else None
+        return with_backoff(call)
     except Exception:
-        return None
+        return None, True
+
+
+# NHL position codes we store as "no position"
+_POS_NORMALIZE = {"UNK": ""}
+
+
+def _d(info: dict[str, Any], key: str) -> str:
+    """Localized NHL field ({"default": "..."}) as a plain string."""
+    v = info.get(key)
+    return (v.get("default") or "") if isinstance(v, dict) else ""
 
 
 def normalize_season_totals(info: dict[str, Any]) -> dict[str, Any]:
-    raw = info.get("seasonTotals", {})
+    raw = info.get("seasonTotals")
     if isinstance(raw, dict):
         return raw
     if isinstance(raw, list) and raw and isinstance(raw[0], dict):
@@ -73,19 +159,37 @@ class Command(BaseCommand):
             "--sleep",
             type=float,
             default=0.05,
-            help="Sleep (seconds) between player landing calls to reduce rate-limit risk. Default: 0.05",
+            help=(
+                "Sleep (seconds) after each landing call to reduce rate-limit risk. Each worker "
+                "sleeps on its own, so overall pacing scales with --workers. Default: 0.05"
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help=f"Concurrent HTTP requests for rosters + player landings (default: {DEFAULT_WORKERS}).",
         )
         parser.add_argument(
             "--limit",
             type=int,
             default=0,
-            help="Stop after updating this many players (0 = no limit). Useful for testing.",
+            help=(
+                "Fetch at most this many player landings (0 = no limit). Useful for testing. "
+                "Landings are fetched up front, so failed or unchanged ones count toward the "
+                "limit too (it used to stop after this many players were saved)."
+            ),
         )
         parser.add_argument(
             "--only-existing",
             action="store_true",
             help="Only update players already in your DB (skip creating new ones).",
         )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Re-download every landing instead of revalidating with ETag/Last-Modified.",
+        )
 
     def handle(self, *args, **options):
         from league.models import Player  # import after Django loads
@@ -94,13 +198,16 @@ class Command(BaseCommand):
         sleep_s: float = float(options.get("sleep") or 0.0)
         limit: int = int(options.get("limit") or 0)
         only_existing: bool = bool(options.get("only_existing"))
+        workers: int = max(1, int(options.get("workers") or DEFAULT_WORKERS))
+        # shared by every worker; no adapter retries, with_backoff() is the only retry layer
+        session = build_session(pool_size=workers, headers=NHL_HEADERS, cached=False)
 
         # Build team list
         if teams_arg:
             team_abbrevs = [t.strip() for t in teams_arg.split(",") if t.strip()]
         else:
             self.stdout.write("Fetching NHL standings for team list...")
-            standings = safe_json("https://api-web.nhle.com/v1/standings/now")
+            standings = safe_json("https://api-web.nhle.com/v1/standings/now", session=session)
             rows = standings.get("standings", []) if isinstance(standings, dict) else []
             team_abbrevs = []
             for row in rows:
@@ -113,163 +220,145 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR("No teams found. Aborting."))
             return
 
-        # Cache existing players by nhl_id if only_existing
-        existing_by_nhl_id = {}
+        # Known nhl_ids if only_existing, so unknown players never get fetched
+        existing_nhl_ids: set[int] = set()
         if only_existing:
-            existing_by_nhl_id = {p.nhl_id: p for p in Player.objects.all().only("id", "nhl_id")}
+            existing_nhl_ids = set(Player.objects.values_list("nhl_id", flat=True))
 
-        updated = 0
-        created = 0
         skipped = 0
+        unchanged = 0
         errors = 0
 
-        # We will collect updates and bulk_update every N for speed
-        bulk_updates: list[Player] = []
-        BULK_EVERY = 250
-
         self.stdout.write(f"Updating players for teams: {', '.join(team_abbrevs)}")
 
-        for team_abbrev in team_abbrevs:
+        def fetch_roster(team_abbrev: str):
             try:
-                roster = safe_json(f"https://api-web.nhle.com/v1/roster/{team_abbrev}/current")
+                return safe_json(f"https://api-web.nhle.com/v1/roster/{team_abbrev}/current", session=session)
             except Exception as e:
-                errors += 1
-                self.stdout.write(self.style.WARNING(f"⚠ Could not fetch roster for {team_abbrev}: {e}"))
-                continue
-
-            players = (
-                roster.get("forwards", [])
-                + roster.get("defensemen", [])
-                + roster.get("goalies", [])
-            )
-
-            for p in players:
-                if limit and (updated + created) >= limit:
-                    break
-
-                player_id = p.get("id")
-                if not player_id:
-                    skipped += 1
-                    continue
-
-                nhl_id = str(player_id)
-
-                if only_existing and nhl_id not in existing_by_nhl_id:
-                    skipped += 1
-                    continue
-
-                info = fetch_landing(int(player_id))
+                return e
+
+        def fetch_one(player_id: int):
+            info = fetch_landing(player_id, session, cache)
+            if sleep_s > 0:
+                time.sleep(sleep_s)
+            return info
+
+        # closed (uncommitted validators dropped) even if anything below raises
+        with nullcontext() if options.get("no_cache") else ConditionalCache() as cache:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                rosters = list(pool.map(fetch_roster, team_abbrevs))
+
+                # (team, player id) for every player we will fetch, in roster order
+                todo: list[tuple[str, int]] = []
+                for team_abbrev, roster in zip(team_abbrevs, rosters):
+                    if isinstance(roster, Exception):
+                        errors += 1
+                        self.stdout.write(self.style.WARNING(f"⚠ Could not fetch roster for {team_abbrev}: {roster}"))
+                        continue
+
+                    players = (
+                        roster.get("forwards", [])
+                        + roster.get("defensemen", [])
+                        + roster.get("goalies", [])
+                    )
+                    for p in players:
+                        player_id = p.get("id")
+                        if not player_id:
+                            skipped += 1
+                            continue
+                        if only_existing and player_id not in existing_nhl_ids:
+                            skipped += 1
+                            continue
+                        todo.append((team_abbrev, int(player_id)))
+
+                if limit:
+                    todo = todo[:limit]
+
+                self.stdout.write(f"Fetching {len(todo)} player landings...")
+                landings = list(pool.map(fetch_one, [player_id for _, player_id in todo]))
+
+            parsed: dict[int, dict[str, Any]] = {}  # nhl_id -> Player field values
+            not_modified: set[int] = set()  # 304s, parsed from the stored landing
+            for (team_abbrev, nhl_id), (info, changed) in zip(todo, landings):
                 if not info:
                     errors += 1
                     continue
+                if not changed:
+                    not_modified.add(nhl_id)
 
-                first = (info.get("firstName") or {}).get("default", "") or ""
-                last = (info.get("lastName") or {}).get("default", "") or ""
-                full_name = info.get("fullName") or f"{first} {last}".strip() or nhl_id
+                full_name = (
+                    info.get("fullName") or f"{_d(info, 'firstName')} {_d(info, 'lastName')}".strip() or str(nhl_id)
+                )
 
                 pos_code = (info.get("positionCode") or "").strip()
-                if pos_code == "UNK":
-                    pos_code = ""
+                pos_code = _POS_NORMALIZE.get(pos_code, pos_code)
 
                 jersey = info.get("sweaterNumber")
                 shoots = info.get("shootsCatches") or ""
 
                 stats = normalize_season_totals(info)
-                games = int(stats.get("gamesPlayed", 0) or 0)
-                goals = int(stats.get("goals", 0) or 0)
-                assists = int(stats.get("assists", 0) or 0)
-                points = stats.get("points", None)
-                if points is None:
-                    points = goals + assists
-                points = int(points)
+                games = int(stats.get("gamesPlayed") or 0)
+                goals = int(stats.get("goals") or 0)
+                assists = int(stats.get("assists") or 0)
+                points = stats.get("points")
+                points = goals + assists if points is None else int(points)
 
                 # placeholder "rank": you’re showing fantasy_score in the UI
                 fantasy_score = float(points)
 
-                if only_existing:
-                    # Update via bulk_update path
-                    obj = Player.objects.get(nhl_id=nhl_id)
-                    obj.full_name = full_name
-                    obj.position = pos_code
-                    obj.number = str(jersey) if jersey is not None else ""
-                    obj.shoots = str(shoots)
-                    obj.nhl_team_abbr = team_abbrev
-                    obj.games_played = games
-                    obj.goals = goals
-                    obj.assists = assists
-                    obj.points = points
-                    obj.fantasy_score = fantasy_score
-                    obj.is_active = True
-                    bulk_updates.append(obj)
-                    updated += 1
+                parsed[nhl_id] = {
+                    "full_name": full_name,
+                    "position": pos_code,
+                    "number": str(jersey) if jersey is not None else "",
+                    "shoots": str(shoots),
+                    "nhl_team_abbr": team_abbrev,
+                    "games_played": games,
+                    "goals": goals,
+                    "assists": assists,
+                    "points": points,
+                    "fantasy_score": fantasy_score,
+                    "is_active": True,
+                }
+
+            # one SELECT for the rows we have landings for (just the columns we overwrite),
+            # then one bulk_update + one bulk_create
+            existing = Player.objects.only("id", "nhl_id", *UPDATE_FIELDS).in_bulk(list(parsed), field_name="nhl_id")
+            now = timezone.now()
+            to_update: list[Player] = []
+            to_create: list[Player] = []
+
+            for nhl_id, fields in parsed.items():
+                obj = existing.get(nhl_id)
+                if obj is None:
+                    if only_existing:
+                        skipped += 1
+                        continue
+                    obj = Player(nhl_id=nhl_id, **fields)
+                    to_create.append(obj)
+                elif nhl_id in not_modified:
+                    # validators are only stored once the row is saved, so it already holds this landing
+                    unchanged += 1
+                    continue
                 else:
-                    obj, was_created = Player.objects.update_or_create(
-                        nhl_id=nhl_id,
-                        defaults={
-                            "full_name": full_name,
-                            "position": pos_code,
-                            "number": str(jersey) if jersey is not None else "",
-                            "shoots": str(shoots),
-                            "nhl_team_abbr": team_abbrev,
-                            "games_played": games,
-                            "goals": goals,
-                            "assists": assists,
-                            "points": points,
-                            "fantasy_score": fantasy_score,
-                            "is_active": True,
-                        },
-                    )
-                    if was_created:
-                        created += 1
-                    else:
-                        updated += 1
-
-                if sleep_s > 0:
-                    time.sleep(sleep_s)
-
-                if only_existing and len(bulk_updates) >= BULK_EVERY:
-                    Player.objects.bulk_update(
-                        bulk_updates,
-                        fields=[
-                            "full_name",
-                            "position",
-                            "number",
-                            "shoots",
-                            "nhl_team_abbr",
-                            "games_played",
-                            "goals",
-                            "assists",
-                            "points",
-                            "fantasy_score",
-                            "is_active",
-                        ],
-                    )
-                    bulk_updates.clear()
-
-            if limit and (updated + created) >= limit:
-                break
-
-        # flush remaining bulk updates
-        if only_existing and bulk_updates:
-            Player.objects.bulk_update(
-                bulk_updates,
-                fields=[
-                    "full_name",
-                    "position",
-                    "number",
-                    "shoots",
-                    "nhl_team_abbr",
-                    "games_played",
-                    "goals",
-                    "assists",
-                    "points",
-                    "fantasy_score",
-                    "is_active",
-                ],
-            )
+                    for name, value in fields.items():
+                        setattr(obj, name, value)
+                    obj.updated_at = now  # auto_now only fires in save()
+                    to_update.append(obj)
+                obj.sync_derived_fields()  # bulk ops skip save()
+
+            with transaction.atomic():
+                bulk_update_fields(Player, to_update, UPDATE_FIELDS)
+                Player.objects.bulk_create(to_create, batch_size=1000)
+
+            if cache is not None:
+                # only now that the rows are saved may later runs trust a 304 for them;
+                # skipped and failed landings are downloaded again next time
+                cache.commit([LANDING_URL.format(obj.nhl_id) for obj in (*to_update, *to_create)])
+        updated = len(to_update)
+        created = len(to_create)
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Done. Updated={updated} Created={created} Skipped={skipped} Errors={errors}"
+                f"Done. Updated={updated} Created={created} Skipped={skipped} Unchanged={unchanged} Errors={errors}"
             )
         )
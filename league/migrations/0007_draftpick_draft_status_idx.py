@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0006_alter_draftpick_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='draftpick',
+            index=models.Index(fields=['draft', 'status'], name='draftpick_draft_status_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0007_draftpick_draft_status_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='draftpick',
+            index=models.Index(condition=models.Q(('player__isnull', False)), fields=['draft', 'player'], name='draftpick_draft_player_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['is_active', '-fantasy_score', 'full_name'], name='player_active_score_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_roster_counts(apps, schema_editor):
+    Roster = apps.get_model("league", "Roster")
+    Team = apps.get_model("league", "Team")
+
+    def count(goalies):
+        rows = Roster.objects.filter(team=OuterRef("pk"))
+        rows = rows.filter(player__position__icontains="G") if goalies else rows.exclude(player__position__icontains="G")
+        return Coalesce(Subquery(rows.values("team").annotate(c=Count("id")).values("c")), 0)
+
+    Team.objects.update(goalie_count=count(True), skater_count=count(False))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0008_player_active_score_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='goalie_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='skater_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_roster_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_total_picks(apps, schema_editor):
+    Draft = apps.get_model("league", "Draft")
+    DraftPick = apps.get_model("league", "DraftPick")
+    picks = DraftPick.objects.filter(draft=OuterRef("pk")).values("draft").annotate(c=Count("id")).values("c")
+    Draft.objects.update(total_picks=Coalesce(Subquery(picks), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0009_team_goalie_count_skater_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='draft',
+            name='total_picks',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_total_picks, migrations.RunPython.noop),
+    ]
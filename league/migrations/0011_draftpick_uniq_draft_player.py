@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0010_draft_total_picks'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='draftpick',
+            name='draftpick_draft_player_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='draftpick',
+            constraint=models.UniqueConstraint(condition=models.Q(('player__isnull', False)), fields=('draft', 'player'), name='uniq_draftpick_draft_player'),
+        ),
+    ]
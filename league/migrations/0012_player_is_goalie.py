@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:05
+
+from django.db import migrations, models
+
+
+def backfill_is_goalie(apps, schema_editor):
+    Player = apps.get_model("league", "Player")
+    Player.objects.filter(position__icontains="G").update(is_goalie=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0011_draftpick_uniq_draft_player'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='is_goalie',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_is_goalie, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_goalie', True)), fields=['-fantasy_score', 'full_name'], name='player_active_goalie_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_goalie', False)), fields=['-fantasy_score', 'full_name'], name='player_active_skater_idx'),
+        ),
+    ]
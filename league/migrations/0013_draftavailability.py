@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def build_for_running_drafts(apps, schema_editor):
+    # drafts already in progress need their availability snapshot to keep autopicking
+    Draft = apps.get_model("league", "Draft")
+    DraftAvailability = apps.get_model("league", "DraftAvailability")
+    DraftPick = apps.get_model("league", "DraftPick")
+    Player = apps.get_model("league", "Player")
+
+    for draft in Draft.objects.filter(is_active=True, is_completed=False):
+        drafted = DraftPick.objects.filter(draft_id=draft.id, player_id=OuterRef("pk"))
+        ranked = (
+            Player.objects.filter(is_active=True)
+            .filter(~Exists(drafted))
+            .order_by("-fantasy_score", "full_name")
+            .values_list("id", "is_goalie")
+        )
+        DraftAvailability.objects.bulk_create(
+            [
+                DraftAvailability(draft_id=draft.id, bucket="G" if is_goalie else "SKATER", rank=rank, player_id=pid)
+                for rank, (pid, is_goalie) in enumerate(ranked, start=1)
+            ],
+            batch_size=5000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0012_player_is_goalie'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DraftAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(choices=[('G', 'Goalie'), ('SKATER', 'Skater')], max_length=10)),
+                ('rank', models.PositiveIntegerField()),
+                ('draft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability', to='league.draft')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='league.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['draft', 'bucket', 'rank'], name='draftavail_bucket_rank_idx'), models.Index(fields=['draft', 'rank'], name='draftavail_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('draft', 'player'), name='uniq_draft_availability_player')],
+            },
+        ),
+        migrations.RunPython(build_for_running_drafts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:08
+
+import re
+
+from django.db import migrations
+
+GOALIE_TOKEN_RE = re.compile(r"(?<![A-Z])G(?![A-Z])", re.IGNORECASE)
+
+
+def retag_goalies(apps, schema_editor):
+    # 0012 used position LIKE '%G%'; only rows containing a G can change
+    Player = apps.get_model("league", "Player")
+    changed = []
+    for player in Player.objects.filter(position__icontains="G").only("id", "position", "is_goalie"):
+        is_goalie = bool(GOALIE_TOKEN_RE.search(player.position))
+        if player.is_goalie != is_goalie:
+            player.is_goalie = is_goalie
+            changed.append(player)
+    Player.objects.bulk_update(changed, ["is_goalie"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0013_draftavailability'),
+    ]
+
+    operations = [
+        migrations.RunPython(retag_goalies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:09
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def backfill_deadline(apps, schema_editor):
+    Draft = apps.get_model("league", "Draft")
+    drafts = list(Draft.objects.filter(is_active=True, is_completed=False, current_pick_started_at__isnull=False))
+    for draft in drafts:
+        draft.current_pick_deadline = draft.current_pick_started_at + timedelta(seconds=draft.time_per_pick)
+    Draft.objects.bulk_update(drafts, ["current_pick_deadline"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0014_player_is_goalie_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='draft',
+            name='current_pick_deadline',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_deadline, migrations.RunPython.noop),
+    ]
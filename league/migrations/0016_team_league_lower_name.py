@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:10
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0015_draft_current_pick_deadline'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='team',
+            index=models.Index(models.F('league'), django.db.models.functions.text.Lower('name'), name='team_league_lower_name'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0016_team_league_lower_name'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='draftpick',
+            name='draftpick_draft_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='draftpick',
+            index=models.Index(condition=models.Q(('status', 'ON_CLOCK')), fields=['draft', 'status'], name='draftpick_on_clock_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='draftpick',
+            constraint=models.UniqueConstraint(fields=('draft', 'pick_number'), name='uniq_draftpick_draft_pick_number'),
+        ),
+    ]
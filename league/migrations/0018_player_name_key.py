@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:16
+
+from django.db import migrations, models
+
+from league.utils.names import player_name_key
+
+
+def backfill_name_key(apps, schema_editor):
+    Player = apps.get_model("league", "Player")
+    players = list(Player.objects.only("id", "full_name"))
+    for p in players:
+        p.name_key = player_name_key(p.full_name or "")
+    Player.objects.bulk_update(players, ["name_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0017_draftpick_on_clock_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='name_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=128),
+        ),
+        migrations.RunPython(backfill_name_key, migrations.RunPython.noop),
+    ]
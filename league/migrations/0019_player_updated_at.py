@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:31
+
+from datetime import datetime, timezone
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def mark_existing_stale(apps, schema_editor):
+    # rows predating the column have unknown freshness; let the next import refetch them
+    Player = apps.get_model("league", "Player")
+    Player.objects.update(updated_at=datetime(2000, 1, 1, tzinfo=timezone.utc))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0018_player_name_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(mark_existing_stale, migrations.RunPython.noop),
+    ]
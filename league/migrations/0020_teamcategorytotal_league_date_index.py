@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0019_player_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teamcategorytotal',
+            index=models.Index(fields=['league', 'date'], name='teamcattotal_league_date'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0020_teamcategorytotal_league_date_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='player',
+            name='nhl_id',
+            field=models.BigIntegerField(unique=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0021_player_nhl_id_bigint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='player',
+            name='position',
+            field=models.CharField(blank=True, db_index=True, max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['on_waivers', 'is_active'], name='player_waivers_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['league', '-created_at'], name='transaction_league_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0022_player_transaction_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='player',
+            name='assists',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='player',
+            name='games_played',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='player',
+            name='goals',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='player',
+            name='points',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
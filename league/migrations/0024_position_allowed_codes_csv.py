@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:33
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_allowed_codes_csv(apps, schema_editor):
+    Position = apps.get_model("league", "Position")
+    codes = defaultdict(list)
+    rows = Position.allowed_player_positions.through.objects.values_list("position_id", "playerposition__code")
+    for position_id, code in rows:
+        codes[position_id].append(code)
+    positions = list(Position.objects.only("id"))
+    for p in positions:
+        p.allowed_codes_csv = ",".join(sorted(codes[p.id]))
+    Position.objects.bulk_update(positions, ["allowed_codes_csv"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0023_player_small_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='position',
+            name='allowed_codes_csv',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_allowed_codes_csv, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0024_position_allowed_codes_csv'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='injured',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='injury_note',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+    ]
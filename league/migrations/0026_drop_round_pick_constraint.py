@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 03:42
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('league', '0025_player_injury_fields'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='draftpick',
+            name='uniq_draft_round_pick_number',
+        ),
+    ]
@@ -1,14 +1,27 @@
 # league/models.py
 from __future__ import annotations
 
+import re
 import secrets
+from collections import defaultdict
+from functools import cached_property
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.functions import Lower
 
+from .utils.names import player_name_key
 from .validators import player_fits_slot
 
+# "G" as its own token in free-text positions ("G", "C/G"), not any word containing a g
+GOALIE_TOKEN_RE = re.compile(r"(?<![A-Z])G(?![A-Z])", re.IGNORECASE)
+
+# fresh invite codes tried before League.save() gives up on unique-index collisions
+INVITE_CODE_ATTEMPTS = 5
+
 
 # ================================================================
 # LEAGUE + ROLES
@@ -49,9 +62,20 @@ class League(models.Model):
     lock_minute = models.PositiveSmallIntegerField(default=0)
 
     def save(self, *args, **kwargs):
-        if not self.invite_code:
+        if self.invite_code:
+            return super().save(*args, **kwargs)
+
+        # rely on the unique index instead of probing first; only a collision costs an extra query
+        for attempt in range(INVITE_CODE_ATTEMPTS):
             self.invite_code = secrets.token_hex(6).upper()
-        super().save(*args, **kwargs)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                taken = League.objects.filter(invite_code=self.invite_code).exclude(pk=self.pk).exists()
+                if not taken or attempt == INVITE_CODE_ATTEMPTS - 1:
+                    self.invite_code = ""
+                    raise
 
     def __str__(self) -> str:
         return f"{self.name} ({self.season_year})"
@@ -86,10 +110,18 @@ class Team(models.Model):
     manager = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
 
+    # roster composition, kept in step by league.draft.services (autopick need)
+    goalie_count = models.PositiveIntegerField(default=0)
+    skater_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["league", "name"], name="uniq_team_name_per_league"),
         ]
+        indexes = [
+            # case-insensitive alpha order within a league (draft order seeding)
+            models.Index("league", Lower("name"), name="team_league_lower_name"),
+        ]
         ordering = ["name"]
 
     def __str__(self) -> str:
@@ -97,11 +129,15 @@ class Team(models.Model):
 
 
 class Player(models.Model):
-    nhl_id = models.CharField(max_length=20, unique=True)
+    nhl_id = models.BigIntegerField(unique=True)
     full_name = models.CharField(max_length=120, db_index=True)
+    # normalized full_name (league.utils.names), matched by the ADP import
+    name_key = models.CharField(max_length=128, db_index=True, blank=True, editable=False)
 
-    # C/LW/RW/D/G
-    position = models.CharField(max_length=10, blank=True)
+    # C/LW/RW/D/G; indexed for the lineup-eligibility position__in lookups
+    position = models.CharField(max_length=10, blank=True, db_index=True)
+    # derived from position in save(); lets goalie/skater filters use an index
+    is_goalie = models.BooleanField(default=False)
 
     number = models.CharField(max_length=10, blank=True)
     shoots = models.CharField(max_length=10, blank=True)
@@ -112,10 +148,11 @@ class Player(models.Model):
     # ADP (Average Draft Position). Lower = better.
     adp = models.FloatField(null=True, blank=True, db_index=True)
 
-    games_played = models.PositiveIntegerField(default=0)
-    goals = models.PositiveIntegerField(default=0)
-    assists = models.PositiveIntegerField(default=0)
-    points = models.PositiveIntegerField(default=0)
+    # season counters never get near 32k, so 2-byte columns keep rows narrow
+    games_played = models.PositiveSmallIntegerField(default=0)
+    goals = models.PositiveSmallIntegerField(default=0)
+    assists = models.PositiveSmallIntegerField(default=0)
+    points = models.PositiveSmallIntegerField(default=0)
 
     # placeholder “rank/score” you can replace later
     fantasy_score = models.FloatField(default=0.0)
@@ -123,12 +160,85 @@ class Player(models.Model):
     on_waivers = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
 
+    # set by update_injuries from the NHL roster status ("I" / "IR")
+    injured = models.BooleanField(default=False)
+    injury_note = models.CharField(max_length=20, null=True, blank=True)
+
+    # last save(); import_players skips landing fetches for recently refreshed players
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         ordering = ["full_name"]
+        indexes = [
+            # best-available lookups: is_active filter + "highest score first" ordering
+            models.Index(fields=["is_active", "-fantasy_score", "full_name"], name="player_active_score_idx"),
+            # autopick by need: ORDER BY reads straight from the matching partial index
+            models.Index(
+                fields=["-fantasy_score", "full_name"],
+                name="player_active_goalie_idx",
+                condition=models.Q(is_active=True, is_goalie=True),
+            ),
+            models.Index(
+                fields=["-fantasy_score", "full_name"],
+                name="player_active_skater_idx",
+                condition=models.Q(is_active=True, is_goalie=False),
+            ),
+            # waiver wire / free agent tabs
+            models.Index(fields=["on_waivers", "is_active"], name="player_waivers_active_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.full_name
 
+    def sync_derived_fields(self) -> None:
+        """
+        Recomputes columns derived from position and full_name. Call before
+        bulk_create/bulk_update, which bypass save().
+        """
+        self.is_goalie = bool(GOALIE_TOKEN_RE.search(self.position or ""))
+        self.name_key = player_name_key(self.full_name or "")
+
+    @classmethod
+    def recompute_scores(cls, league, players=None) -> int:
+        """
+        Recomputes fantasy_score for players (default: everyone rostered in
+        league) with the league's weights, loaded once, and writes them back
+        with bulk_update. Returns the number of players scored.
+        """
+        from .utils.scoring import calculate_player_score, get_scoring_weights  # scoring imports this module
+
+        if players is None:
+            players = cls.objects.filter(roster__team__league=league).distinct().iterator(chunk_size=1000)
+        weights = get_scoring_weights(league)
+        batch_size = getattr(settings, "SCORE_BULK_BATCH_SIZE", 500)
+
+        scored = 0
+        batch = []
+        with transaction.atomic():
+            for player in players:
+                player.fantasy_score = calculate_player_score(player, league, weights=weights)
+                batch.append(player)
+                if len(batch) >= batch_size:
+                    cls.objects.bulk_update(batch, ["fantasy_score"])
+                    scored += len(batch)
+                    batch = []
+            if batch:
+                cls.objects.bulk_update(batch, ["fantasy_score"])
+                scored += len(batch)
+        return scored
+
+    def save(self, *args, **kwargs):
+        self.sync_derived_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if "position" in update_fields:
+                update_fields.add("is_goalie")
+            if "full_name" in update_fields:
+                update_fields.add("name_key")
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
 
 # ================================================================
 # PLAYER POSITIONS (Independent of League)
@@ -156,6 +266,9 @@ class Position(models.Model):
         blank=True,
         related_name="allowed_in_positions",
     )
+    # allowed_player_positions codes, comma-separated; rebuilt by the receivers
+    # in league.utils.positions so eligibility checks read one column
+    allowed_codes_csv = models.CharField(max_length=200, blank=True, default="", editable=False)
 
     class Meta:
         constraints = [
@@ -165,6 +278,18 @@ class Position(models.Model):
     def __str__(self) -> str:
         return f"{self.code} ({self.league.name})"
 
+    @cached_property
+    def allowed_codes(self) -> frozenset:
+        """
+        PlayerPosition codes allowed in this slot; empty means anyone (BN, IR).
+        Uses prefetch_related("allowed_player_positions") when present, else
+        the denormalized allowed_codes_csv column.
+        """
+        prefetched = getattr(self, "_prefetched_objects_cache", {}).get("allowed_player_positions")
+        if prefetched is not None:
+            return frozenset(p.code for p in prefetched)
+        return frozenset(filter(None, self.allowed_codes_csv.split(",")))
+
 
 # ================================================================
 # DRAFT MODELS
@@ -196,12 +321,16 @@ class Draft(models.Model):
     is_completed = models.BooleanField(default=False)
 
     current_pick = models.PositiveIntegerField(default=1)
+    # rounds x teams, fixed when the grid is built / the draft starts
+    total_picks = models.PositiveIntegerField(default=0)
 
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
     # server-side clock enforcement
     current_pick_started_at = models.DateTimeField(null=True, blank=True)
+    # current_pick_started_at + time_per_pick, so expiry can be checked in SQL
+    current_pick_deadline = models.DateTimeField(null=True, blank=True)
 
     def __str__(self) -> str:
         return f"Draft – {self.league.name}"
@@ -223,6 +352,12 @@ class DraftOrder(models.Model):
         return f"{self.draft} – {self.position}: {self.team.name}"
 
 
+class DraftPickQuerySet(models.QuerySet):
+    def with_related(self, *extra):
+        """Joins what __str__ and the draft board read (team, player, draft), plus any extra lookups."""
+        return self.select_related("team", "player", "draft", *extra)
+
+
 class DraftPick(models.Model):
     STATUS_UPCOMING = "UPCOMING"
     STATUS_ON_CLOCK = "ON_CLOCK"
@@ -263,12 +398,29 @@ class DraftPick(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     made_at = models.DateTimeField(null=True, blank=True)
 
+    objects = DraftPickQuerySet.as_manager()
+
     class Meta:
         constraints = [
-            # ✅ pick_number repeats each round, so include round_number
+            # pick_number is the overall pick (1..rounds x teams), never reset per round;
+            # the clock moves by it and round_number is derived from it
+            models.UniqueConstraint(
+                fields=["draft", "pick_number"],
+                name="uniq_draftpick_draft_pick_number",
+            ),
+            # a player can be drafted once per draft; also serves the "already drafted" anti-joins
             models.UniqueConstraint(
-                fields=["draft", "round_number", "pick_number"],
-                name="uniq_draft_round_pick_number",
+                fields=["draft", "player"],
+                condition=models.Q(player__isnull=False),
+                name="uniq_draftpick_draft_player",
+            ),
+        ]
+        indexes = [
+            # at most one ON_CLOCK row per draft, so this stays tiny
+            models.Index(
+                fields=["draft", "status"],
+                condition=models.Q(status="ON_CLOCK"),
+                name="draftpick_on_clock_idx",
             ),
         ]
         ordering = ["round_number", "pick_number"]
@@ -298,14 +450,53 @@ class DraftPick(models.Model):
         return super().save(*args, **kwargs)
 
 
+class DraftAvailability(models.Model):
+    """
+    Undrafted players of a running draft, ranked once at start_draft (or at the
+    first autopick of a draft that was activated some other way).
+    Autopick reads the lowest rank in a bucket; rows are deleted as players are drafted.
+    """
+    BUCKET_GOALIE = "G"
+    BUCKET_SKATER = "SKATER"
+
+    BUCKETS = [
+        (BUCKET_GOALIE, "Goalie"),
+        (BUCKET_SKATER, "Skater"),
+    ]
+
+    draft = models.ForeignKey("Draft", on_delete=models.CASCADE, related_name="availability")
+    bucket = models.CharField(max_length=10, choices=BUCKETS)
+    rank = models.PositiveIntegerField()
+    player = models.ForeignKey("Player", on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["draft", "player"], name="uniq_draft_availability_player"),
+        ]
+        indexes = [
+            models.Index(fields=["draft", "bucket", "rank"], name="draftavail_bucket_rank_idx"),
+            models.Index(fields=["draft", "rank"], name="draftavail_rank_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.draft_id} – {self.bucket} #{self.rank}: {self.player_id}"
+
+
 # ================================================================
 # ROSTERS
 # ================================================================
 
+class RosterQuerySet(models.QuerySet):
+    def with_related(self, *extra):
+        return self.select_related("team", "player", *extra)
+
+
 class Roster(models.Model):
     team = models.ForeignKey("Team", on_delete=models.CASCADE)
     player = models.ForeignKey("Player", on_delete=models.CASCADE)
 
+    objects = RosterQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["team", "player"], name="uniq_roster_team_player"),
@@ -332,11 +523,18 @@ class DailyLineup(models.Model):
         return f"{self.team.name} — {self.date}"
 
 
+class DailySlotQuerySet(models.QuerySet):
+    def with_related(self, *extra):
+        return self.select_related("lineup", "slot", "player", *extra)
+
+
 class DailySlot(models.Model):
     lineup = models.ForeignKey("DailyLineup", on_delete=models.CASCADE)
     player = models.ForeignKey("Player", on_delete=models.SET_NULL, null=True, blank=True)
     slot = models.ForeignKey("Position", on_delete=models.CASCADE)
 
+    objects = DailySlotQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["lineup", "slot"], name="uniq_daily_slot_lineup_slot"),
@@ -346,12 +544,67 @@ class DailySlot(models.Model):
         if self.player:
             player_fits_slot(self.player, self.slot)
 
-        if DailySlot.objects.filter(lineup=self.lineup, slot=self.slot).exclude(id=self.id).exists():
+        # (taken slot ids, roster player ids) for the lineup, attached by bulk_clean()
+        cache = getattr(self, "_cache", None)
+        if cache is not None:
+            taken, roster_player_ids = cache
+            slot_taken = self.slot_id in taken
+            taken.add(self.slot_id)  # two slots in one batch can't share a slot either
+            on_roster = self.player_id in roster_player_ids
+        elif getattr(self, "_bulk_clean_pending", False):
+            # the admin lineup formset checks every row at once with bulk_clean()
+            return
+        else:
+            # both checks in one round trip
+            slot_taken, on_roster = (
+                DailyLineup.objects.filter(pk=self.lineup_id)
+                .annotate(
+                    slot_taken=Exists(
+                        DailySlot.objects.filter(lineup=OuterRef("pk"), slot_id=self.slot_id).exclude(id=self.id)
+                    ),
+                    on_roster=Exists(Roster.objects.filter(team=OuterRef("team"), player_id=self.player_id)),
+                )
+                .values_list("slot_taken", "on_roster")
+                .get()
+            )
+
+        if slot_taken:
             raise ValidationError(f"Slot {self.slot.code} already assigned.")
 
-        if self.player and not Roster.objects.filter(team=self.lineup.team, player=self.player).exists():
+        if self.player and not on_roster:
             raise ValidationError(f"{self.player.full_name} is not on this team's roster.")
 
+    @classmethod
+    def bulk_clean(cls, slots) -> None:
+        """
+        clean() for many slots: two queries per lineup (taken slots, roster)
+        instead of two per slot. Raises ValidationError on the first bad slot.
+        """
+        slots = list(slots)
+        by_lineup = defaultdict(list)
+        for s in slots:
+            by_lineup[s.lineup_id].append(s)
+
+        try:
+            for group in by_lineup.values():
+                lineup = group[0].lineup
+                taken = set()
+                if lineup.pk is not None:  # a lineup being added has no saved slots yet
+                    taken = set(
+                        cls.objects.filter(lineup=lineup)
+                        .exclude(id__in=[s.id for s in group if s.id])
+                        .values_list("slot_id", flat=True)
+                    )
+                roster_player_ids = set(
+                    Roster.objects.filter(team_id=lineup.team_id).values_list("player_id", flat=True)
+                )
+                for s in group:
+                    s._cache = (taken, roster_player_ids)
+                    s.clean()
+        finally:
+            for s in slots:
+                s.__dict__.pop("_cache", None)
+
     def __str__(self) -> str:
         return f"{self.lineup.date} — {self.slot.code}"
 
@@ -456,6 +709,10 @@ class Transaction(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # per-league activity feed, newest first
+            models.Index(fields=["league", "-created_at"], name="transaction_league_recent_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.action} — {self.player} ({self.created_at})"
@@ -479,6 +736,11 @@ class Trade(models.Model):
         return f"Trade {self.id}: {self.from_team} ↔ {self.to_team}"
 
 
+class TradeItemQuerySet(models.QuerySet):
+    def with_related(self, *extra):
+        return self.select_related("player", "trade", "from_team", "to_team", *extra)
+
+
 class TradeItem(models.Model):
     trade = models.ForeignKey("Trade", on_delete=models.CASCADE, related_name="items")
     player = models.ForeignKey("Player", on_delete=models.CASCADE)
@@ -491,6 +753,8 @@ class TradeItem(models.Model):
         blank=True,
     )
 
+    objects = TradeItemQuerySet.as_manager()
+
     def __str__(self) -> str:
-        return f"{self.player} in Trade {self.trade.id}"
+        return f"{self.player} in Trade {self.trade_id}"
 
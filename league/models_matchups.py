@@ -27,6 +27,11 @@ class TeamCategoryTotal(models.Model):
 
     class Meta:
         unique_together = ("team", "date", "category")
+        indexes = [
+            # daily aggregation/scoring read and clear a whole league-day at once
+            # (Matchup needs no extra index: its unique_together leads with league, date)
+            models.Index(fields=["league", "date"], name="teamcattotal_league_date"),
+        ]
 
 
 class MatchupCategoryResult(models.Model):
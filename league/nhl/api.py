@@ -1,5 +1,6 @@
 import requests
 import random
+from requests.adapters import HTTPAdapter
 
 # Modern NHL web API (this is what you've been curling successfully)
 NHL_DOMAIN = "api-web.nhle.com"
@@ -22,18 +23,52 @@ DEFAULT_HEADERS = {
 }
 
 
-def try_request(url, headers, verify: bool):
+class PinnedAdapter(HTTPAdapter):
+    """
+    Sends requests for `hostname` to a fixed IP, while TLS still uses the real
+    hostname for SNI and certificate checks (so verification stays on).
+    """
+
+    def __init__(self, ip: str, hostname: str = NHL_DOMAIN, **kwargs):
+        self.ip = ip
+        self.hostname = hostname
+        super().__init__(**kwargs)  # calls init_poolmanager, so set ip/hostname first
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["server_hostname"] = self.hostname
+        kwargs["assert_hostname"] = self.hostname
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        request.url = request.url.replace(f"://{self.hostname}", f"://{self.ip}", 1)
+        request.headers["Host"] = self.hostname
+        return super().send(request, **kwargs)
+
+
+# one keep-alive session per route (None = normal DNS), reused across calls
+_SESSIONS = {}
+
+
+def get_session(ip: str | None = None) -> requests.Session:
+    session = _SESSIONS.get(ip)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        if ip:
+            session.mount(f"https://{NHL_DOMAIN}", PinnedAdapter(ip))
+        _SESSIONS[ip] = session
+    return session
+
+
+def try_request(url, headers=None, ip: str | None = None):
     """
     Low-level helper with:
-      - DEFAULT_HEADERS merged in
+      - DEFAULT_HEADERS on a shared keep-alive session
       - short timeout
       - JSON decode guarded
     """
-    merged_headers = DEFAULT_HEADERS.copy()
-    merged_headers.update(headers or {})
-
     try:
-        resp = requests.get(url, headers=merged_headers, timeout=6, verify=verify)
+        resp = get_session(ip).get(url, headers=headers, timeout=6)
         resp.raise_for_status()
         return resp.json()
     except Exception:
@@ -42,13 +77,10 @@ def try_request(url, headers, verify: bool):
 
 def try_via_ip(ip: str, endpoint: str):
     """
-    Use direct IP + Host spoofing as a fallback if DNS breaks.
+    Use a direct IP as a fallback if DNS breaks (TLS still verified against NHL_DOMAIN).
     """
-    url = f"https://{ip}{BASE_PATH}{endpoint}"
-    headers = {
-        "Host": NHL_DOMAIN,
-    }
-    return try_request(url, headers, verify=False)
+    url = f"https://{NHL_DOMAIN}{BASE_PATH}{endpoint}"
+    return try_request(url, ip=ip)
 
 
 def nhl_get(endpoint: str):
@@ -64,7 +96,7 @@ def nhl_get(endpoint: str):
 
     # 1) Normal domain (best case)
     url = f"https://{NHL_DOMAIN}{BASE_PATH}{endpoint}"
-    data = try_request(url, {}, verify=True)
+    data = try_request(url)
     if data:
         return data
 
@@ -9,7 +9,8 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils import timezone
 
-from league.models import Draft, DraftOrder, DraftPick, Player, Roster
+from league.models import Draft, DraftOrder, DraftPick, Player
+from league.utils.rosters import add_to_roster
 
 
 @dataclass(frozen=True)
@@ -122,7 +123,8 @@ def _validate_player_available(draft: Draft, player: Player) -> None:
 def _add_player_to_team_roster(team_id: int, player: Player) -> None:
     # Basic roster insert. If you have extra rules later (max size, slot fit),
     # this is where they go.
-    Roster.objects.create(team_id=team_id, player=player)
+    # INSERT ... ON CONFLICT DO NOTHING plus the Team goalie/skater counter bump
+    add_to_roster(team_id=team_id, player_id=player.id)
 
 
 @transaction.atomic
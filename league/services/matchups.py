@@ -1,13 +1,15 @@
 # league/services/matchups.py
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Optional, Sequence, Tuple
 
 from django.db import transaction
 
 from league.models import ScoringCategory
 from league.models_matchups import Matchup, MatchupCategoryResult, TeamCategoryTotal
+from league.services.daily_totals import _category_code_field
 
 
 @dataclass(frozen=True)
@@ -27,14 +29,22 @@ def _winner_for_category(*, lower_is_better: bool, home_value: float, away_value
     return "HOME" if home_value > away_value else "AWAY"
 
 
-def compare_daily_categories(*, league, home_totals_by_code: Dict[str, float], away_totals_by_code: Dict[str, float]):
-    categories = ScoringCategory.objects.filter(league=league).order_by("id")
+def compare_daily_categories(
+    *,
+    league,
+    home_totals_by_code: Dict[str, float],
+    away_totals_by_code: Dict[str, float],
+    categories: Optional[Sequence[ScoringCategory]] = None,
+):
+    if categories is None:
+        categories = ScoringCategory.objects.filter(league=league).order_by("id")
+    code_field = _category_code_field()
 
     results_by_code: Dict[str, CategoryCompareResult] = {}
     home_cats = away_cats = ties = 0
 
     for cat in categories:
-        code = getattr(cat, "code", None)
+        code = getattr(cat, code_field, None)
         if not code:
             continue
 
@@ -69,13 +79,15 @@ def compute_and_store_matchup_results(*, matchup: Matchup) -> Dict[str, int]:
     Pulls TeamCategoryTotal rows for the matchup date and stores MatchupCategoryResult rows.
     Mark matchup.processed = True.
     """
+    code_field = _category_code_field()
+
     def totals_for_team(team_id: int) -> Dict[str, float]:
         rows = (
             TeamCategoryTotal.objects
             .filter(league=matchup.league, team_id=team_id, date=matchup.date)
             .select_related("category")
         )
-        return {r.category.code: float(r.value) for r in rows if getattr(r.category, "code", None)}
+        return {getattr(r.category, code_field): float(r.value) for r in rows if getattr(r.category, code_field, None)}
 
     home_totals = totals_for_team(matchup.home_team_id)
     away_totals = totals_for_team(matchup.away_team_id)
@@ -88,7 +100,7 @@ def compute_and_store_matchup_results(*, matchup: Matchup) -> Dict[str, int]:
 
     MatchupCategoryResult.objects.filter(matchup=matchup).delete()
 
-    cats = {c.code: c for c in ScoringCategory.objects.filter(league=matchup.league)}
+    cats = {getattr(c, code_field): c for c in ScoringCategory.objects.filter(league=matchup.league)}
 
     MatchupCategoryResult.objects.bulk_create(
         [
@@ -108,3 +120,61 @@ def compute_and_store_matchup_results(*, matchup: Matchup) -> Dict[str, int]:
     matchup.save(update_fields=["processed"])
 
     return summary
+
+
+@transaction.atomic
+def compute_and_store_all_matchup_results(*, league, day) -> Dict[Matchup, Dict[str, int]]:
+    """
+    compute_and_store_matchup_results for every Matchup of league on day, in a
+    fixed number of queries: one read of the day's TeamCategoryTotal rows, one
+    delete + bulk_create of results, one UPDATE for processed.
+    Returns {matchup: summary}.
+    """
+    matchups = list(
+        Matchup.objects.filter(league=league, date=day).select_related("league", "home_team", "away_team")
+    )
+    if not matchups:
+        return {}
+
+    code_field = _category_code_field()
+    categories = list(ScoringCategory.objects.filter(league=league).order_by("id"))
+    cats = {getattr(c, code_field): c for c in categories}
+
+    totals_by_team: Dict[int, Dict[str, float]] = defaultdict(dict)
+    rows = TeamCategoryTotal.objects.filter(league=league, date=day).values_list(
+        "team_id", f"category__{code_field}", "value"
+    )
+    for team_id, code, value in rows:
+        if code:
+            totals_by_team[team_id][code] = float(value)
+
+    summaries: Dict[Matchup, Dict[str, int]] = {}
+    results = []
+    for matchup in matchups:
+        results_by_code, summary = compare_daily_categories(
+            league=league,
+            home_totals_by_code=totals_by_team.get(matchup.home_team_id, {}),
+            away_totals_by_code=totals_by_team.get(matchup.away_team_id, {}),
+            categories=categories,
+        )
+        results.extend(
+            MatchupCategoryResult(
+                matchup=matchup,
+                category=cats[code],
+                home_value=r.home_value,
+                away_value=r.away_value,
+                winner=r.winner,
+            )
+            for code, r in results_by_code.items()
+            if code in cats
+        )
+        summaries[matchup] = summary
+
+    MatchupCategoryResult.objects.filter(matchup__in=matchups).delete()
+    MatchupCategoryResult.objects.bulk_create(results)
+
+    Matchup.objects.filter(pk__in=[m.pk for m in matchups]).update(processed=True)
+    for matchup in matchups:
+        matchup.processed = True
+
+    return summaries
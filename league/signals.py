@@ -60,8 +60,11 @@ def initialize_league_defaults(sender, instance, created, **kwargs):
     # 1. PLAYER POSITIONS
     # -----------------------------------------
     base_positions = ["C", "LW", "RW", "D", "G"]
+    # one SELECT for the (almost always existing) codes; get_or_create only for new ones
+    player_positions = {p.code: p for p in PlayerPosition.objects.filter(code__in=base_positions)}
     for code in base_positions:
-        PlayerPosition.objects.get_or_create(code=code)
+        if code not in player_positions:
+            player_positions[code], _ = PlayerPosition.objects.get_or_create(code=code)
 
     # -----------------------------------------
     # 2. LINEUP SLOT DEFINITIONS
@@ -84,9 +87,8 @@ def initialize_league_defaults(sender, instance, created, **kwargs):
         )
 
         # Assign allowed player positions
-        for pos_code in allowed_codes:
-            pos = PlayerPosition.objects.get(code=pos_code)
-            slot.allowed_player_positions.add(pos)
+        if allowed_codes:
+            slot.allowed_player_positions.add(*(player_positions[c] for c in allowed_codes))
 
     # -----------------------------------------
     # 3. SCORING CATEGORIES
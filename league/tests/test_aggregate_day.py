@@ -0,0 +1,13 @@
+# league/tests/test_aggregate_day.py
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+
+class AggregateDayCommandTests(TestCase):
+    def test_requires_a_league_selection(self):
+        with self.assertRaisesMessage(CommandError, "one of the arguments --league_id --league_ids --all is required"):
+            call_command("aggregate_day")
+
+    def test_unknown_league_id(self):
+        with self.assertRaisesMessage(CommandError, "League id(s) not found: [999]"):
+            call_command("aggregate_day", league_id=999)
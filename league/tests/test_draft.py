@@ -0,0 +1,64 @@
+# league/tests/test_draft.py
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from league.draft.services import DraftCreateConfig, autopick_current, create_or_rebuild_draft, make_pick, start_draft
+from league.models import Draft, DraftAvailability, DraftPick, League, Player, Roster, Team
+
+
+class DraftServiceTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.users = [User.objects.create(username=f"manager{i}") for i in range(2)]
+        # ALPHA order: team A picks first
+        self.team_a = Team.objects.create(league=self.league, name="A", manager=self.users[0])
+        self.team_b = Team.objects.create(league=self.league, name="B", manager=self.users[1])
+
+        self.goalies = [
+            Player.objects.create(nhl_id=100 + i, full_name=f"Goalie {i}", position="G", fantasy_score=50 - i)
+            for i in range(3)
+        ]
+        # skaters outrank every goalie, so a goalie pick can only come from position need
+        self.skaters = [
+            Player.objects.create(nhl_id=200 + i, full_name=f"Skater {i}", position="C", fantasy_score=100 - i)
+            for i in range(3)
+        ]
+
+        self.draft = Draft.objects.create(league=self.league, order_mode="ALPHA")
+        create_or_rebuild_draft(draft=self.draft, config=DraftCreateConfig(rounds=3, time_per_pick=60))
+
+    def test_duplicate_pick_raises_value_error(self):
+        start_draft(draft=self.draft)
+        make_pick(draft=self.draft, user=self.users[0], player_id=self.skaters[0].id)
+
+        with self.assertRaisesMessage(ValueError, "Player already drafted."):
+            make_pick(draft=self.draft, user=self.users[1], player_id=self.skaters[0].id)
+
+        # the failed pick stays on the clock for team B
+        current = DraftPick.objects.get(draft=self.draft, status=DraftPick.STATUS_ON_CLOCK)
+        self.assertEqual((current.pick_number, current.team_id), (2, self.team_b.id))
+
+    def test_autopick_takes_goalie_until_team_has_two(self):
+        start_draft(draft=self.draft)
+
+        self.assertEqual(autopick_current(draft=self.draft), self.goalies[0].id)
+        self.team_a.refresh_from_db()
+        self.assertEqual((self.team_a.goalie_count, self.team_a.skater_count), (1, 0))
+
+    def test_autopick_takes_skater_once_team_has_two_goalies(self):
+        # rostered outside the draft; the Roster receivers keep the counters current
+        for goalie in self.goalies[1:]:
+            Roster.objects.create(team=self.team_a, player=goalie)
+        start_draft(draft=self.draft)
+
+        self.assertEqual(autopick_current(draft=self.draft), self.skaters[0].id)
+        self.team_a.refresh_from_db()
+        self.assertEqual((self.team_a.goalie_count, self.team_a.skater_count), (2, 1))
+
+    def test_autopick_builds_missing_availability(self):
+        # e.g. a draft activated before DraftAvailability existed
+        start_draft(draft=self.draft)
+        DraftAvailability.objects.filter(draft=self.draft).delete()
+
+        self.assertEqual(autopick_current(draft=self.draft), self.goalies[0].id)
+        self.assertEqual(DraftAvailability.objects.filter(draft=self.draft).count(), 5)
@@ -0,0 +1,39 @@
+# league/tests/test_import_adp.py
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+
+try:
+    from league.management.commands import import_adp
+except ImportError:  # pandas / lxml not installed
+    import_adp = None
+
+
+def _page(headers, row):
+    head = "".join(f"<th>{h}</th>" for h in headers)
+    cells = "".join(f"<td>{c}</td>" for c in row)
+    return f"<html><body><table><tr>{head}</tr><tr>{cells}</tr></table></body></html>"
+
+
+@skipIf(import_adp is None, "import_adp needs pandas and lxml")
+class ReadAdpTableTests(SimpleTestCase):
+    def test_header_cells_are_matched_by_substring(self):
+        html = _page(
+            ["Rank", "Player Team (Bye)", "POS", "Yahoo", "ESPN", "CBS", "AVG"],
+            ["1", "Connor McDavid EDM", "C1", "1.0", "1.0", "1.0", "1.0"],
+        )
+        adp_df = import_adp._read_adp_table(html)
+        cols = import_adp._map_columns(adp_df)
+
+        self.assertEqual(cols["player"], "Player Team (Bye)")
+        self.assertEqual(adp_df[cols["player"]].tolist(), ["Connor McDavid EDM"])
+        self.assertEqual(adp_df[cols["avg"]].tolist(), ["1.0"])
+
+    def test_non_ascii_names_survive_a_page_without_meta_charset(self):
+        html = _page(
+            ["Rank", "Player", "POS", "AVG"],
+            ["1", "Tim Stützle OTT", "C1", "12.0"],
+        )
+        adp_df = import_adp._read_adp_table(html)
+
+        self.assertEqual(adp_df["Player"].tolist(), ["Tim Stützle OTT"])
@@ -0,0 +1,35 @@
+# league/tests/test_league.py
+from unittest import mock
+
+from django.db import IntegrityError
+from django.test import TestCase
+
+from league.models import INVITE_CODE_ATTEMPTS, League
+
+
+class InviteCodeTests(TestCase):
+    def test_generates_code(self):
+        league = League.objects.create(name="First")
+        self.assertEqual(len(league.invite_code), 12)
+
+    def test_retries_on_collision(self):
+        taken = League.objects.create(name="First").invite_code
+        codes = iter([taken, taken, "BEEF00"])
+        with mock.patch("league.models.secrets.token_hex", lambda n: next(codes)):
+            league = League.objects.create(name="Second")
+
+        self.assertEqual(league.invite_code, "BEEF00")
+        self.assertEqual(League.objects.count(), 2)
+
+    def test_gives_up_after_max_attempts(self):
+        taken = League.objects.create(name="First").invite_code
+        token_hex = mock.Mock(return_value=taken)
+        with mock.patch("league.models.secrets.token_hex", token_hex), self.assertRaises(IntegrityError):
+            League.objects.create(name="Second")
+
+        self.assertEqual(token_hex.call_count, INVITE_CODE_ATTEMPTS)
+        self.assertEqual(League.objects.count(), 1)
+
+    def test_keeps_explicit_code(self):
+        league = League.objects.create(name="First", invite_code="MYCODE")
+        self.assertEqual(league.invite_code, "MYCODE")
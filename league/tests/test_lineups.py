@@ -0,0 +1,117 @@
+# league/tests/test_lineups.py
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from league.models import DailyLineup, DailySlot, League, Player, PlayerPosition, Position, Roster, Team
+
+
+class DailySlotValidationTests(TestCase):
+    def setUp(self):
+        league = League.objects.create(name="Test League")
+        self.team = Team.objects.create(league=league, name="A", manager=User.objects.create(username="manager"))
+        self.lineup = DailyLineup.objects.create(team=self.team, date=datetime.date(2025, 1, 5))
+
+        center = PlayerPosition.objects.create(code="C")
+        goalie = PlayerPosition.objects.create(code="G")
+        self.c_slot = Position.objects.create(league=league, code="C")
+        self.c_slot.allowed_player_positions.add(center)
+        self.g_slot = Position.objects.create(league=league, code="G")
+        self.g_slot.allowed_player_positions.add(goalie)
+        self.bench = Position.objects.create(league=league, code="BN")  # no allowed codes: anyone
+
+        self.center = Player.objects.create(nhl_id=1, full_name="Center", position="C")
+        self.winger = Player.objects.create(nhl_id=2, full_name="Winger", position="C/LW")
+        self.free_agent = Player.objects.create(nhl_id=3, full_name="Free Agent", position="C")
+        Roster.objects.create(team=self.team, player=self.center)
+        Roster.objects.create(team=self.team, player=self.winger)
+
+    def slot(self, position, player):
+        return DailySlot(lineup=self.lineup, slot=position, player=player)
+
+    def test_clean_accepts_eligible_player(self):
+        self.slot(self.c_slot, self.center).clean()
+        self.slot(self.c_slot, self.winger).clean()  # any of a multi-position player's codes
+        self.slot(self.bench, self.center).clean()
+
+    def test_clean_rejects_wrong_position(self):
+        with self.assertRaisesMessage(ValidationError, "Center cannot play G."):
+            self.slot(self.g_slot, self.center).clean()
+
+    def test_clean_rejects_taken_slot(self):
+        DailySlot.objects.create(lineup=self.lineup, slot=self.c_slot, player=self.center)
+        with self.assertRaisesMessage(ValidationError, "Slot C already assigned."):
+            self.slot(self.c_slot, self.winger).clean()
+
+    def test_clean_rejects_player_off_roster(self):
+        with self.assertRaisesMessage(ValidationError, "Free Agent is not on this team's roster."):
+            self.slot(self.c_slot, self.free_agent).clean()
+
+    def test_bulk_clean_matches_clean(self):
+        DailySlot.bulk_clean([self.slot(self.c_slot, self.center), self.slot(self.bench, self.winger)])
+
+        cases = [
+            ([self.slot(self.g_slot, self.center)], "Center cannot play G."),
+            ([self.slot(self.c_slot, self.free_agent)], "Free Agent is not on this team's roster."),
+            # two slots of one batch can't share a lineup slot either
+            ([self.slot(self.c_slot, self.center), self.slot(self.c_slot, self.winger)], "Slot C already assigned."),
+        ]
+        for slots, message in cases:
+            with self.subTest(message=message), self.assertRaisesMessage(ValidationError, message):
+                DailySlot.bulk_clean(slots)
+
+        # the per-batch cache never outlives the call
+        slots = [self.slot(self.c_slot, self.center)]
+        DailySlot.bulk_clean(slots)
+        self.assertFalse(hasattr(slots[0], "_cache"))
+
+    def test_bulk_clean_sees_saved_slots(self):
+        DailySlot.objects.create(lineup=self.lineup, slot=self.c_slot, player=self.center)
+        with self.assertRaisesMessage(ValidationError, "Slot C already assigned."):
+            DailySlot.bulk_clean([self.slot(self.c_slot, self.winger)])
+
+
+class DailyLineupAdminTests(TestCase):
+    """The admin lineup page is where slots are saved; its formset validates them with bulk_clean()."""
+
+    def setUp(self):
+        league = League.objects.create(name="Test League")
+        self.team = Team.objects.create(league=league, name="A", manager=User.objects.create(username="manager"))
+        self.lineup = DailyLineup.objects.create(team=self.team, date=datetime.date(2025, 1, 5))
+
+        self.c_slot = Position.objects.create(league=league, code="C")
+        self.c_slot.allowed_player_positions.add(PlayerPosition.objects.create(code="C"))
+        self.bench = Position.objects.create(league=league, code="BN")
+
+        self.center = Player.objects.create(nhl_id=1, full_name="Center", position="C")
+        self.free_agent = Player.objects.create(nhl_id=3, full_name="Free Agent", position="C")
+        Roster.objects.create(team=self.team, player=self.center)
+
+        self.client.force_login(User.objects.create_superuser(username="admin", password="x"))
+        self.url = f"/admin/league/dailylineup/{self.lineup.id}/change/"
+
+    def post_slots(self, *rows):
+        data = {
+            "team": self.team.id,
+            "date": "2025-01-05",
+            "dailyslot_set-TOTAL_FORMS": len(rows),
+            "dailyslot_set-INITIAL_FORMS": 0,
+        }
+        for i, (position, player) in enumerate(rows):
+            data[f"dailyslot_set-{i}-slot"] = position.id
+            data[f"dailyslot_set-{i}-player"] = player.id
+        return self.client.post(self.url, data)
+
+    def test_saves_valid_slots(self):
+        response = self.post_slots((self.c_slot, self.center))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(DailySlot.objects.filter(lineup=self.lineup).count(), 1)
+
+    def test_rejects_player_off_roster(self):
+        response = self.post_slots((self.c_slot, self.center), (self.bench, self.free_agent))
+
+        self.assertContains(response, "Free Agent is not on this team&#x27;s roster.")
+        self.assertFalse(DailySlot.objects.filter(lineup=self.lineup).exists())
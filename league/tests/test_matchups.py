@@ -0,0 +1,54 @@
+# league/tests/test_matchups.py
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from league.models import League, ScoringCategory, Team
+from league.models_matchups import Matchup, MatchupCategoryResult, TeamCategoryTotal
+from league.services.matchups import compute_and_store_all_matchup_results, compute_and_store_matchup_results
+
+
+class MatchupResultsTests(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="Test League")
+        self.day = datetime.date(2025, 1, 5)
+        teams = [
+            Team.objects.create(league=self.league, name=f"T{i}", manager=User.objects.create(username=f"m{i}"))
+            for i in range(4)
+        ]
+        categories = [
+            ScoringCategory.objects.create(league=self.league, stat_key=key, name=key, lower_is_better=(key == "ga"))
+            for key in ("goals", "assists", "ga")
+        ]
+        for i, team in enumerate(teams):
+            for cat in categories:
+                # assists tie everywhere; ga is lower-is-better
+                value = 3 if cat.stat_key == "assists" else i
+                TeamCategoryTotal.objects.create(league=self.league, team=team, date=self.day, category=cat, value=value)
+
+        self.matchups = [
+            Matchup.objects.create(league=self.league, date=self.day, home_team=teams[0], away_team=teams[1]),
+            Matchup.objects.create(league=self.league, date=self.day, home_team=teams[3], away_team=teams[2]),
+        ]
+
+    def stored_results(self):
+        return sorted(
+            MatchupCategoryResult.objects.values_list("matchup_id", "category__stat_key", "home_value", "away_value", "winner")
+        )
+
+    def test_batched_results_match_per_matchup_path(self):
+        expected = {m.pk: compute_and_store_matchup_results(matchup=m) for m in self.matchups}
+        expected_rows = self.stored_results()
+        Matchup.objects.update(processed=False)
+
+        summaries = compute_and_store_all_matchup_results(league=self.league, day=self.day)
+
+        self.assertEqual({m.pk: s for m, s in summaries.items()}, expected)
+        self.assertEqual(self.stored_results(), expected_rows)
+        self.assertEqual(Matchup.objects.filter(processed=True).count(), 2)
+        # goals: higher wins, ga: lower wins, assists: tie
+        self.assertEqual(expected[self.matchups[0].pk], {"home_cats": 1, "away_cats": 1, "ties": 1})
+
+    def test_no_matchups(self):
+        self.assertEqual(compute_and_store_all_matchup_results(league=self.league, day=datetime.date(2025, 1, 6)), {})
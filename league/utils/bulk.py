@@ -0,0 +1,86 @@
+# league/utils/bulk.py
+# Set-based column updates for the import commands.
+
+from django.db import connection, transaction
+
+# pairs per statement; keeps the VALUES list (and bind params) bounded
+VALUES_BATCH = 5000
+
+
+def update_column_by_id(model, column: str, values: dict, batch_size: int = 500) -> int:
+    """
+    Writes {pk: value} into model.<column>.
+
+    PostgreSQL: one UPDATE ... FROM (VALUES ...) per batch, joined on the pk.
+    Other backends: bulk_update on pk-only instances (a CASE WHEN per batch).
+    Returns the number of pks written.
+    """
+    if not values:
+        return 0
+
+    if connection.vendor != "postgresql":
+        model.objects.bulk_update(
+            [model(pk=pk, **{column: value}) for pk, value in values.items()],
+            [column],
+            batch_size=batch_size,
+        )
+        return len(values)
+
+    meta = model._meta
+    field = meta.get_field(column)
+    qn = connection.ops.quote_name
+    row = f"(%s::{meta.pk.db_type(connection)}, %s::{field.db_type(connection)})"
+    items = list(values.items())
+
+    with transaction.atomic(), connection.cursor() as cur:
+        for i in range(0, len(items), VALUES_BATCH):
+            chunk = items[i:i + VALUES_BATCH]
+            cur.execute(
+                f"UPDATE {qn(meta.db_table)} AS t SET {qn(field.column)} = v.val "
+                f"FROM (VALUES {', '.join([row] * len(chunk))}) AS v(id, val) "
+                f"WHERE t.{qn(meta.pk.column)} = v.id",
+                [param for pair in chunk for param in pair],
+            )
+    return len(values)
+
+
+def bulk_update_fields(model, objs, fields: list[str], batch_size: int | None = None) -> int:
+    """
+    bulk_update for wide rows (several columns per object).
+
+    PostgreSQL: one UPDATE ... FROM (VALUES (pk, col1, col2, ...), ...) per
+    batch, same bind-param budget as update_column_by_id.
+    Other backends: bulk_update, with the batch shrunk as the field count
+    grows, since each batch is one CASE WHEN per field over every row in it.
+    Returns the number of objects written.
+    """
+    objs = list(objs)
+    if not objs:
+        return 0
+
+    if connection.vendor != "postgresql":
+        model.objects.bulk_update(objs, fields, batch_size=batch_size or max(50, 500 // len(fields)))
+        return len(objs)
+
+    meta = model._meta
+    cols = [meta.get_field(name) for name in fields]
+    qn = connection.ops.quote_name
+    row = "(" + ", ".join(f"%s::{f.db_type(connection)}" for f in [meta.pk, *cols]) + ")"
+    aliases = ", ".join(["id", *[f"c{i}" for i in range(len(cols))]])
+    assignments = ", ".join(f"{qn(f.column)} = v.c{i}" for i, f in enumerate(cols))
+    per_statement = max(1, (2 * VALUES_BATCH) // (len(cols) + 1))
+
+    with transaction.atomic(), connection.cursor() as cur:
+        for i in range(0, len(objs), per_statement):
+            chunk = objs[i:i + per_statement]
+            params = []
+            for obj in chunk:
+                params.append(obj.pk)
+                params.extend(f.get_db_prep_save(getattr(obj, f.attname), connection) for f in cols)
+            cur.execute(
+                f"UPDATE {qn(meta.db_table)} AS t SET {assignments} "
+                f"FROM (VALUES {', '.join([row] * len(chunk))}) AS v({aliases}) "
+                f"WHERE t.{qn(meta.pk.column)} = v.id",
+                params,
+            )
+    return len(objs)
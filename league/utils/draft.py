@@ -1,31 +1,17 @@
-from league.models import Draft, DraftPick, Team
+from django.db import transaction
 
-def generate_draft_order(draft: Draft):
-    teams = list(Team.objects.filter(league=draft.league))
-    team_count = len(teams)
-
-    picks = []
-    overall = 1
+from league.draft.services import build_draft_picks
+from league.models import Draft, DraftOrder, DraftPick, Team
 
-    for round_num in range(1, draft.rounds + 1):
 
-        if draft.format == "SNAKE":
-            # odd rounds = 1→N, even rounds = N→1
-            order = teams if round_num % 2 == 1 else list(reversed(teams))
-        else:
-            # straight (1→N every round)
-            order = teams
-
-        for pick_num, team in enumerate(order, start=1):
-            picks.append(
-                DraftPick(
-                    draft=draft,
-                    round_number=round_num,
-                    pick_number=pick_num,
-                    overall_number=overall,
-                    team=team
-                )
-            )
-            overall += 1
+@transaction.atomic
+def generate_draft_order(draft: Draft):
+    """
+    Rebuilds the pick grid from the draft's DraftOrder (league teams by id if
+    there is none) in one bulk_create. SNAKE reverses even rounds.
+    """
+    order = [o.team for o in DraftOrder.objects.filter(draft=draft).select_related("team").order_by("position")]
+    teams = order or list(Team.objects.filter(league_id=draft.league_id).order_by("id"))
 
-    DraftPick.objects.bulk_create(picks)
+    DraftPick.objects.filter(draft=draft).delete()
+    return build_draft_picks(draft=draft, base_order=teams)
@@ -1,7 +1,10 @@
 import random
+from django.db import transaction
 from django.utils import timezone
+from league.draft.services import DRAFT_BULK_BATCH_SIZE
 from league.models import DraftOrder, Draft
 
+@transaction.atomic
 def maybe_randomize_draft_order(draft: Draft):
     """
     Runs 30 minutes before draft time if order_type is RANDOM.
@@ -26,12 +29,10 @@ def maybe_randomize_draft_order(draft: Draft):
 
     # Assign positions
     DraftOrder.objects.filter(draft=draft).delete()
-    for i, team in enumerate(teams, start=1):
-        DraftOrder.objects.create(
-            draft=draft,
-            team=team,
-            position=i
-        )
+    DraftOrder.objects.bulk_create(
+        [DraftOrder(draft=draft, team=team, position=i) for i, team in enumerate(teams, start=1)],
+        batch_size=DRAFT_BULK_BATCH_SIZE,
+    )
 
     draft.randomized = True
     draft.save()
@@ -0,0 +1,140 @@
+# league/utils/http.py
+# Shared requests.Session for the import commands: one keep-alive connection
+# pool per command run, plus an on-disk response cache when requests-cache is
+# installed (rosters and landings change at most daily). Callers that must
+# always hit the network pass cached=False.
+
+import json
+import sqlite3
+import threading
+from datetime import timedelta
+from typing import Any
+
+import requests
+from django.conf import settings
+from urllib3.util.retry import Retry
+
+try:
+    import requests_cache
+except ImportError:  # optional; without it every run goes to the network
+    requests_cache = None
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json parses the same payloads, just slower
+    orjson = None
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
+
+# transient statuses worth retrying (rate limit + upstream hiccups)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def loads_json(content: bytes | str) -> Any:
+    """Parses a response body (r.content) with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def build_session(
+    *, pool_size: int = 10, headers: dict | None = None, cached: bool = True, retries: int = 0
+) -> requests.Session:
+    """
+    Returns a Session whose HTTPS adapter keeps up to pool_size connections
+    alive (size it to the number of threads sharing it). With retries > 0,
+    GETs that fail to connect or hit RETRY_STATUSES are retried with
+    exponential backoff, honouring Retry-After.
+    """
+    if cached and requests_cache is not None:
+        session = requests_cache.CachedSession(
+            getattr(settings, "HTTP_CACHE_NAME", "nhl_http_cache"),
+            backend="sqlite",
+            expire_after=timedelta(hours=getattr(settings, "HTTP_CACHE_HOURS", 12)),
+            cache_control=True,  # honour ETag / Cache-Control where the server sends them
+        )
+    else:
+        session = requests.Session()
+
+    max_retries = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response back so raise_for_status() reports it
+    ) if retries else 0
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+
+class ConditionalCache:
+    """
+    URL -> (ETag, Last-Modified, body) in a small SQLite file. get_json sends
+    If-None-Match / If-Modified-Since from the stored copy; a 304 returns the
+    stored body without downloading it again. Safe to share across threads.
+
+    New validators are held back until commit() is called for their URLs, so
+    call it only once the data has been saved; anything not committed is
+    dropped on close() and downloaded again on the next run.
+
+        with ConditionalCache() as cache:
+            data, changed = cache.get_json(session, url, timeout=10)
+            save(data)
+            cache.commit([url])
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or getattr(settings, "HTTP_CONDITIONAL_CACHE", "nhl_conditional_cache.sqlite3")
+        self._lock = threading.Lock()
+        self._pending = {}  # url -> (etag, last_modified, body) not yet committed
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def commit(self, urls=None) -> None:
+        """Stores the pending validators for urls (default: all of them)."""
+        with self._lock:
+            keys = list(self._pending) if urls is None else [u for u in urls if u in self._pending]
+            rows = [(url, *self._pending.pop(url)) for url in keys]
+            self._db.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", rows)
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._pending.clear()
+            self._db.close()
+
+    def get_json(self, session: requests.Session, url: str, **kwargs) -> tuple[Any, bool]:
+        """Returns (data, changed); changed is False when the server answered 304."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, body FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if row:
+            if row[0]:
+                headers["If-None-Match"] = row[0]
+            if row[1]:
+                headers["If-Modified-Since"] = row[1]
+
+        r = session.get(url, headers=headers, **kwargs)
+        if r.status_code == 304 and row:
+            return loads_json(row[2]), False
+        r.raise_for_status()
+        data = loads_json(r.content)
+
+        etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+        if etag or last_modified:  # nothing to revalidate with otherwise
+            with self._lock:
+                self._pending[url] = (etag, last_modified, r.text)
+        return data, True
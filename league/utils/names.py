@@ -0,0 +1,83 @@
+# league/utils/names.py
+# Player-name normalization shared by Player.name_key and the ADP importer.
+# Keep this module free of model imports; league.models imports it.
+
+import re
+import unicodedata
+from functools import lru_cache
+
+_RE_PAREN = re.compile(r"\([^)]*\)")
+# suffixes and any other non-letters become spaces in one scan; a suffix always
+# sits after whitespace/punctuation, so the extra space collapses away below
+_RE_SCRUB = re.compile(r"\b(?:jr|sr|ii|iii|iv|v)\b\.?|[^a-z\s]")
+_RE_WS = re.compile(r"\s+")
+# no-break / thin spaces that HTML tables put between name parts
+_WS_TABLE = str.maketrans({"\u00a0": " ", "\u2009": " ", "\u202f": " "})
+# O'Reilly -> oreilly, hyphen -> space
+_PUNCT_TABLE = str.maketrans({"'": "", "-": " "})
+
+
+def clean_name(name: str) -> str:
+    if not isinstance(name, str):
+        name = str(name)
+    return _RE_WS.sub(" ", name.translate(_WS_TABLE)).strip()
+
+
+def _nfkd_strip(s: str) -> str:
+    return "".join(
+        ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch)
+    )
+
+
+# Latin-1 Supplement + Latin Extended-A/B (é, ö, š, ř, ...) precomputed with the
+# same NFKD strip, so str.translate folds nearly every NHL name in one C pass.
+_ACCENT_TABLE = str.maketrans({chr(cp): _nfkd_strip(chr(cp)) for cp in range(0x00C0, 0x0250)})
+
+
+def strip_accents(s: str) -> str:
+    if s.isascii():  # most NHL names; nothing to decompose
+        return s
+    folded = s.translate(_ACCENT_TABLE)
+    if folded.isascii():
+        return folded
+    return _nfkd_strip(s)  # something outside the table; same result, slower path
+
+
+@lru_cache(maxsize=4096)
+def base_name_key(s: str) -> str:
+    """
+    Normalize names: case/accents/punct/suffixes.
+    Does NOT strip trailing team abbrev. (that's handled separately)
+    """
+    s = clean_name(s).lower()
+    s = strip_accents(s)
+
+    # handle "Last, First" (rare; most sources are "First Last")
+    last, comma, first = s.partition(",")
+    if comma:
+        last, first = last.strip(), first.strip()
+        if last and first:
+            s = f"{first} {last}"
+
+    # normalize punctuation; "st." is multi-char so it stays a replace
+    s = s.replace("st.", "st").translate(_PUNCT_TABLE)
+
+    # remove parentheses content; must run first, since it can create new word
+    # boundaries for the suffix match
+    if "(" in s:
+        s = _RE_PAREN.sub("", s)
+
+    # remove suffixes, keep only letters/spaces
+    s = _RE_SCRUB.sub(" ", s)
+
+    return _RE_WS.sub(" ", s).strip()
+
+
+def player_name_key(s: str) -> str:
+    """
+    Key stored on Player.name_key for a DB full_name.
+    DO NOT strip 2-4 letter tokens (that was the bug: Fox/Hill/Aho/etc).
+    """
+    k = base_name_key(s)
+    k = k.replace("alexandar georgiev", "alexander georgiev")
+    return k
@@ -0,0 +1,119 @@
+# league/utils/positions.py
+# Cached lookups for the small, rarely-edited position tables.
+# Entries are invalidated by the receivers below; with the default per-process
+# LocMemCache other workers only pick up edits once POSITION_CACHE_TIMEOUT expires.
+# The same receivers keep Position.allowed_codes_csv in step with the M2M.
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from league.models import PlayerPosition, Position
+
+PLAYER_POSITIONS_KEY = "league:player_positions"
+ALLOWED_CODES_KEY = "league:position:{}:allowed_codes"
+
+
+def _timeout() -> int:
+    return getattr(settings, "POSITION_CACHE_TIMEOUT", 3600)
+
+
+def get_player_positions() -> dict:
+    """
+    Returns {code: PlayerPosition} for every global player position.
+    """
+    positions = cache.get(PLAYER_POSITIONS_KEY)
+    if positions is None:
+        positions = {p.code: p for p in PlayerPosition.objects.all()}
+        cache.set(PLAYER_POSITIONS_KEY, positions, _timeout())
+    return positions
+
+
+def get_allowed_codes(position_id: int) -> frozenset:
+    """
+    Returns the PlayerPosition codes allowed in a lineup slot (Position).
+    """
+    key = ALLOWED_CODES_KEY.format(position_id)
+    codes = cache.get(key)
+    if codes is None:
+        codes = frozenset(
+            PlayerPosition.objects.filter(allowed_in_positions=position_id).values_list("code", flat=True)
+        )
+        cache.set(key, codes, _timeout())
+    return codes
+
+
+def rebuild_allowed_codes_csv(position_ids, *, exclude_player_position_id=None) -> None:
+    """
+    Rewrites Position.allowed_codes_csv from the M2M rows for position_ids
+    (one read, one bulk_update).
+    """
+    position_ids = list(position_ids)
+    if not position_ids:
+        return
+    rows = Position.allowed_player_positions.through.objects.filter(position_id__in=position_ids)
+    if exclude_player_position_id is not None:
+        rows = rows.exclude(playerposition_id=exclude_player_position_id)
+
+    codes = defaultdict(list)
+    for position_id, code in rows.values_list("position_id", "playerposition__code"):
+        codes[position_id].append(code)
+
+    Position.objects.bulk_update(
+        [Position(pk=pid, allowed_codes_csv=",".join(sorted(codes[pid]))) for pid in position_ids],
+        ["allowed_codes_csv"],
+    )
+
+
+def _forget_allowed_codes(position_ids) -> None:
+    cache.delete_many([ALLOWED_CODES_KEY.format(pid) for pid in position_ids])
+
+
+@receiver(post_save, sender=PlayerPosition)
+def _player_position_saved(sender, instance, created, **kwargs):
+    cache.delete(PLAYER_POSITIONS_KEY)
+    if created:
+        return  # not in any slot yet
+    position_ids = list(instance.allowed_in_positions.values_list("id", flat=True))
+    _forget_allowed_codes(position_ids)
+    rebuild_allowed_codes_csv(position_ids)  # the code may have been renamed
+
+
+@receiver(pre_delete, sender=PlayerPosition)
+def _player_position_deleted(sender, instance, **kwargs):
+    # pre_delete: the M2M rows are still there, so we can find affected slots
+    cache.delete(PLAYER_POSITIONS_KEY)
+    position_ids = list(instance.allowed_in_positions.values_list("id", flat=True))
+    _forget_allowed_codes(position_ids)
+    rebuild_allowed_codes_csv(position_ids, exclude_player_position_id=instance.pk)
+
+
+@receiver(post_delete, sender=Position)
+def _position_deleted(sender, instance, **kwargs):
+    _forget_allowed_codes([instance.pk])
+
+
+@receiver(m2m_changed, sender=Position.allowed_player_positions.through)
+def _allowed_positions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # reverse clear() reports no pk_set, so note the slots while the rows still exist
+        instance._cleared_position_ids = list(instance.allowed_in_positions.values_list("id", flat=True))
+        return
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        position_ids = [instance.pk]
+    elif pk_set:
+        position_ids = list(pk_set)
+    else:
+        position_ids = instance.__dict__.pop("_cleared_position_ids", [])
+    _forget_allowed_codes(position_ids)
+    rebuild_allowed_codes_csv(position_ids)
+
+    if not reverse:
+        # keep the in-memory slot current too
+        instance.allowed_codes_csv = Position.objects.values_list("allowed_codes_csv", flat=True).get(pk=instance.pk)
+        instance.__dict__.pop("allowed_codes", None)
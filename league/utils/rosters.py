@@ -0,0 +1,66 @@
+# league/utils/rosters.py
+# Roster writes that keep Team.goalie_count / Team.skater_count (read by
+# autopick) in step with the Roster table.
+# add_to_roster() is the bulk insert path used by both draft engines; the
+# receivers below cover everything that goes through save()/delete()
+# (admin, shell, cascades from Team/Player deletes).
+
+from django.db.models import Case, Count, Exists, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from league.models import Player, Roster, Team
+
+
+def add_to_roster(*, team_id: int, player_id: int) -> None:
+    """
+    INSERT-or-nothing on Roster plus the matching counter bump. The bump runs
+    first and is skipped when the roster row already exists, so the counters
+    never double-count. bulk_create sends no post_save, so the receivers
+    below don't count it again.
+    """
+    already = Roster.objects.filter(team_id=team_id, player_id=player_id)
+    is_goalie = Exists(Player.objects.filter(id=player_id, is_goalie=True))
+    Team.objects.filter(id=team_id).filter(~Exists(already)).update(
+        goalie_count=F("goalie_count") + Case(When(is_goalie, then=Value(1)), default=Value(0)),
+        skater_count=F("skater_count") + Case(When(is_goalie, then=Value(0)), default=Value(1)),
+    )
+    Roster.objects.bulk_create([Roster(team_id=team_id, player_id=player_id)], ignore_conflicts=True)
+
+
+def sync_roster_counts(*, league_id: int | None = None, team_ids=None) -> None:
+    """
+    Recomputes goalie_count / skater_count from Roster for every team in a
+    league, or for the given team ids.
+    """
+    def _count(goalies: bool):
+        rows = Roster.objects.filter(team=OuterRef("pk"))
+        rows = rows.filter(player__is_goalie=goalies)
+        return Coalesce(Subquery(rows.values("team").annotate(c=Count("id")).values("c")), 0)
+
+    teams = Team.objects.all()
+    if league_id is not None:
+        teams = teams.filter(league_id=league_id)
+    if team_ids is not None:
+        teams = teams.filter(id__in=team_ids)
+    teams.update(goalie_count=_count(True), skater_count=_count(False))
+
+
+@receiver(pre_save, sender=Roster)
+def _roster_saving(sender, instance, **kwargs):
+    # an edited row may have moved to another team; remember where it was
+    if instance.pk:
+        instance._old_team_id = Roster.objects.filter(pk=instance.pk).values_list("team_id", flat=True).first()
+
+
+@receiver(post_save, sender=Roster)
+def _roster_saved(sender, instance, created, **kwargs):
+    team_ids = {instance.team_id, instance.__dict__.pop("_old_team_id", None)} - {None}
+    sync_roster_counts(team_ids=team_ids)
+
+
+@receiver(post_delete, sender=Roster)
+def _roster_deleted(sender, instance, **kwargs):
+    # runs after the row is gone, so the recount already excludes it
+    sync_roster_counts(team_ids=[instance.team_id])
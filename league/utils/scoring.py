@@ -13,21 +13,24 @@ def get_scoring_weights(league):
     categories = ScoringCategory.objects.filter(league=league)
     return {cat.stat_key: cat.weight for cat in categories}
 
-def calculate_player_score(player, league):
+def calculate_player_score(player, league, weights=None):
     """
     Calculate a fantasy score for a single player,
     using the league's scoring weights.
+    Pass weights (from get_scoring_weights) when scoring many players.
     """
 
-    weights = get_scoring_weights(league)
+    if weights is None:
+        weights = get_scoring_weights(league)
 
     # Extract player stats
     stats = {
         "goals": player.goals,
         "assists": player.assists,
-        "shots": player.shots,
-        "hits": player.hits,
-        "plus_minus": player.plus_minus,
+        # not tracked on Player yet
+        "shots": getattr(player, "shots", 0),
+        "hits": getattr(player, "hits", 0),
+        "plus_minus": getattr(player, "plus_minus", 0),
         "games_played": player.games_played,
 
         # goalie stats (if applicable)
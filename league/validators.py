@@ -2,12 +2,14 @@ from django.core.exceptions import ValidationError
 
 def player_fits_slot(player, slot_position):
     """
-    Ensures a player can legally fit a lineup slot.
-    Example: player.position = "C", slot_position = "LW" → invalid.
+    Ensures a player can legally fit a lineup slot (Position).
+    Example: player.position = "C", slot allows only "LW" → invalid.
+    Multi-position players ("C/LW") fit if any of their positions is allowed.
     """
-    if player.position != slot_position:
+    allowed = slot_position.allowed_codes
+    if allowed and allowed.isdisjoint((player.position or "").upper().split("/")):
         raise ValidationError(
-            f"{player.name} cannot play {slot_position}. They are a {player.position}."
+            f"{player.full_name} cannot play {slot_position.code}. They are a {player.position}."
         )
     return True
 
@@ -19,8 +19,10 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
 from league.draft.services import (
+    DRAFT_BULK_BATCH_SIZE,
     DraftCreateConfig,
     create_or_rebuild_draft,
+    draft_service_queryset,
     make_pick,
     start_draft,
     tick_draft,
@@ -45,6 +47,7 @@ from .models import (
     Team,
 )
 from .models_matchups import Matchup
+from .utils.positions import get_allowed_codes
 
 
 # -------------------------------------------------------
@@ -133,10 +136,10 @@ def create_league(request):
                 ("D", "Defense"),
                 ("G", "Goalie"),
             ]
-            pp = {}
+            pp = {p.code: p for p in PlayerPosition.objects.filter(code__in=[code for code, _ in core_pp])}
             for code, desc in core_pp:
-                obj, _ = PlayerPosition.objects.get_or_create(code=code, defaults={"description": desc})
-                pp[code] = obj
+                if code not in pp:
+                    pp[code], _ = PlayerPosition.objects.get_or_create(code=code, defaults={"description": desc})
 
             allowed_map = {
                 "C": ["C"],
@@ -235,7 +238,7 @@ def team_home(request, team_id: int):
 
     roster_qs = Roster.objects.filter(team=team).select_related("player")
     roster_count = roster_qs.count()
-    goalie_count = roster_qs.filter(player__position__iexact="G").count()
+    goalie_count = roster_qs.filter(player__is_goalie=True).count()
     skater_count = roster_count - goalie_count
 
     pos_counts = {}
@@ -268,7 +271,7 @@ def team_roster(request, league_id: int):
     if not team:
         return render(request, "league/no_team.html")
 
-    roster = Roster.objects.filter(team=team).select_related("player")
+    roster = Roster.objects.filter(team=team).with_related()
     return render(request, "league/team_roster.html", {"league": league, "team": team, "roster": roster})
 
 
@@ -283,7 +286,7 @@ def daily_lineup(request, league_id: int):
         return render(request, "league/no_team.html")
 
     lineup, _ = DailyLineup.objects.get_or_create(team=team, date=timezone.now().date())
-    slots = DailySlot.objects.filter(lineup=lineup).select_related("player", "slot")
+    slots = DailySlot.objects.filter(lineup=lineup).with_related()
     return render(
         request,
         "league/daily_lineup.html",
@@ -467,7 +470,8 @@ def commish_manual_draft_order(request, league_id: int):
         with transaction.atomic():
             DraftOrder.objects.filter(draft=draft).delete()
             DraftOrder.objects.bulk_create(
-                [DraftOrder(draft=draft, team=t, position=i + 1) for i, t in enumerate(new_teams)]
+                [DraftOrder(draft=draft, team=t, position=i + 1) for i, t in enumerate(new_teams)],
+                batch_size=DRAFT_BULK_BATCH_SIZE,
             )
 
             if draft.order_mode != "MANUAL":
@@ -536,12 +540,12 @@ def draft_room(request, league_id: int):
 
     is_commissioner = league.commissioner_id == request.user.id or role.role in ("COMMISSIONER", "CO_COMMISSIONER")
 
-    draft = Draft.objects.filter(league=league).first()
+    draft = draft_service_queryset().filter(league=league).first()
     if not draft:
         draft = Draft.objects.create(league=league)
 
     try:
-        tick_draft(draft)
+        tick_draft(draft=draft)
     except Exception:
         pass
 
@@ -562,7 +566,7 @@ def draft_room(request, league_id: int):
 
     picks = (
         DraftPick.objects.filter(draft=draft, player__isnull=False)
-        .select_related("player", "team")
+        .with_related()
         .order_by("round_number", "pick_number")
     )
 
@@ -598,13 +602,9 @@ def draft_room(request, league_id: int):
         available_qs = available_qs.filter(full_name__icontains=q)
 
     if selected_pos != "ALL":
-        pos_obj = (
-            Position.objects.filter(league=league, code=selected_pos)
-            .prefetch_related("allowed_player_positions")
-            .first()
-        )
-        if pos_obj:
-            allowed_codes = list(pos_obj.allowed_player_positions.values_list("code", flat=True))
+        pos_id = Position.objects.filter(league=league, code=selected_pos).values_list("id", flat=True).first()
+        if pos_id:
+            allowed_codes = list(get_allowed_codes(pos_id))
             if allowed_codes:
                 available_qs = available_qs.filter(position__in=allowed_codes)
             else:
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from nhlpy import NHLClient
+
+HEADERS = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
+
+# teams / rosters / season stats change at most daily
+CACHE_DIR = Path(os.environ.get("NHL_CACHE_DIR", Path(tempfile.gettempdir()) / "nhl"))
+CACHE_TTL = 24 * 60 * 60
+
+
+def pooled_client(timeout: int = 10):
+    """
+    NHLClient whose requests share one keep-alive httpx.Client.
+
+    nhlpy opens a new httpx.Client (new TCP + TLS handshake) for every call,
+    so we route its HttpClient.get through a single pooled client instead.
+    Returns (client, http); close http when done.
+    """
+    client = NHLClient(timeout=timeout)
+    http = httpx.Client(
+        headers=HEADERS,
+        timeout=timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    )
+
+    inner = client._http_client
+
+    def get(endpoint, resource, query_params=None):
+        r = http.get(url=f"{endpoint.value}{resource}", params=query_params)
+        inner._handle_response(r, resource)
+        return r
+
+    inner.get = get
+    return client, http
+
+
+def _cached(name, args, fetch):
+    """
+    Returns the JSON payload cached on disk for (name, args), calling fetch()
+    and storing the result when it is missing or older than CACHE_TTL.
+    """
+    key = hashlib.sha1(json.dumps([name, *args]).encode()).hexdigest()[:16]
+    path = CACHE_DIR / f"{name}-{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime < CACHE_TTL:
+            return json.loads(path.read_text())
+    except (OSError, ValueError):
+        pass
+
+    data = fetch()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data))
+    tmp.replace(path)
+    return data
+
+
+def get_teams(client, date: str = "now"):
+    return _cached("teams", [date], lambda: client.teams.teams(date=date))
+
+
+def get_roster(client, abbr: str, season: str):
+    return _cached("roster", [abbr, season], lambda: client.teams.team_roster(abbr, season))
+
+
+def get_skater_stats(client, franchise_id, season: str):
+    return _cached(
+        "skater_stats",
+        [str(franchise_id), season],
+        lambda: client.stats.skater_stats_summary(
+            start_season=season,
+            end_season=season,
+            franchise_id=str(franchise_id),
+            game_type_id=2,
+            aggregate=False,
+            limit=500,
+        ),
+    )